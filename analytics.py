@@ -11,225 +11,335 @@ Analytics_Output/.
 """ 
 
 import os
-import json
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 from typing import Tuple
 
 # utils contains required constants and get_logger function
-from utils import VALIDATION_DIR, ANALYTICS_DIR, CHART_DIR, get_logger
+from utils import VALIDATION_DIR, ANALYTICS_DIR, CHART_DIR, ensure_output_dirs, get_logger
 
 # config 
-# ensure directories exist (redundant but safe)
-os.makedirs(ANALYTICS_DIR, exist_ok=True)
-os.makedirs(CHART_DIR, exist_ok=True)
-
 ANALYTICS_FILE = "analytics_report.json"
+# column projections for the wide clean tables; only what the insights read
+# gets parsed (recipes/users are loaded whole since they feed summary CSVs)
+INTERACTION_COLUMNS = ["user_id", "recipe_id", "type", "rating"]
+INGREDIENT_COLUMNS = ["recipe_id", "name"]
+STEP_COLUMNS = ["recipe_id", "step_no"]
+INTERACTION_TYPES = ["view", "like", "cook_attempt", "rating"]
+# popularity weight per interaction type, in INTERACTION_TYPES order
+POPULARITY_WEIGHTS = np.array([1, 5, 10, 2])
+# low-cardinality columns are parsed straight into categoricals, so type
+# filters become integer-code compares and groupbys hash codes, not strings
+RECIPE_DTYPES = {"difficulty": pd.CategoricalDtype(["Easy", "Medium", "Hard"], ordered=True)}
+INTERACTION_DTYPES = {"type": "category"}
+USER_DTYPES = {"city": "category", "state": "category"}
 # placeholder for assignment PDF path (matches developer instruction)
 ASSIGNMENT_PDF_PATH = "D:/Assignment_DataEngineer/data_engineer_test.pdf" 
+# chart resolution; screen-review default, set CHART_DPI=150 for print-quality charts
+CHART_DPI = int(os.getenv("CHART_DPI", "100"))
 logger = get_logger("Analytics")
 
 # non-interactive backend for server/headless environments
 plt.switch_backend('Agg') 
+# render settings fixed once per process: simplified/chunked paths for Agg and a
+# single explicit font, so no per-figure font-family resolution
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["agg.path.chunksize"] = 10000
+matplotlib.rcParams["font.family"] = "DejaVu Sans"
 
 #  utility 
-def save_chart(fig: plt.Figure, filename: str):
+def _fill_zero(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    fillna(0) over every column. Categorical columns with gaps get 0 added
+    as a category first (a plain fillna(0) can't add one), so missing cities
+    etc. are written as 0 just like numeric gaps.
+    """
+    categorical = [name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    df = df.fillna({name: 0 for name in df.columns if name not in categorical})
+    for name in categorical:
+        if df[name].isna().any():
+            df[name] = df[name].cat.add_categories([0]).fillna(0)
+    return df
+
+def _top_counts(s: pd.Series, n: int = 5) -> pd.Series:
+    """
+    value_counts().head(n) of a categorical column, with ties in the order
+    the same values as plain strings give (first appearance in the data),
+    not category (alphabetical) order. Unused categories are left out.
+    """
+    codes = s.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    seen = pd.unique(codes)
+    counts = pd.Series(np.bincount(codes, minlength=len(s.cat.categories))[seen],
+                       index=pd.Index(s.cat.categories[seen], name=s.name), name="count")
+    return counts.sort_values(ascending=False).head(n)
+
+# one Figure per worker process, reused across its chart jobs (plain Agg
+# canvas, no pyplot figure manager); see reusable_figure
+_figure = None
+
+def reusable_figure(figsize) -> Figure:
+    """Returns this process's Figure, cleared and resized for the next chart."""
+    global _figure
+    if _figure is None:
+        _figure = Figure(figsize=figsize)
+        FigureCanvasAgg(_figure)
+    else:
+        _figure.clear()
+        # tight_layout of the previous chart moved the margins; start from defaults again
+        _figure.subplotpars.update(**{k: matplotlib.rcParams[f"figure.subplot.{k}"]
+                                      for k in ("left", "right", "bottom", "top", "wspace", "hspace")})
+        _figure.set_size_inches(figsize)
+    return _figure
+
+def save_chart(fig: Figure, filename: str):
     """Tighten and save a matplotlib Figure to the charts folder."""
     fig.tight_layout()
-    fig.savefig(os.path.join(CHART_DIR, filename), dpi=150)
-    plt.close(fig)
+    fig.savefig(os.path.join(CHART_DIR, filename), dpi=CHART_DPI)
+
+def plot_and_save(plot_fn, data, filename: str, figsize):
+    """Draws one queued chart on the worker's reusable Figure and saves it (runs in a worker process)."""
+    fig = reusable_figure(figsize)
+    ax = fig.add_subplot()
+    plot_fn(ax, data)
+    save_chart(fig, filename)
+
+def render_charts(charts):
+    """Renders all queued chart jobs in parallel; chart data is small, so it pickles cheaply."""
+    with ProcessPoolExecutor(max_workers=min(len(charts), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(plot_and_save, *job) for job in charts]
+        for future in futures:
+            future.result()  # re-raise any rendering error from the workers
 
 # load data 
+def _read_clean(filename: str, **kwargs) -> pd.DataFrame:
+    """Reads one clean CSV with the multi-threaded PyArrow parser."""
+    return pd.read_csv(os.path.join(VALIDATION_DIR, filename), engine="pyarrow", **kwargs)
+
 # the return type now includes the steps DataFrame (s_df)
 def load_clean_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Loads CLEAN data from validation output."""
+    """Loads CLEAN data from validation output (each file is scanned once)."""
     try:
-        r_df = pd.read_csv(os.path.join(VALIDATION_DIR, "clean_recipe.csv"))
-        i_df = pd.read_csv(os.path.join(VALIDATION_DIR, "clean_interactions.csv"))
-        ing_df = pd.read_csv(os.path.join(VALIDATION_DIR, "clean_ingredients.csv"))
-        u_df = pd.read_csv(os.path.join(VALIDATION_DIR, "clean_users.csv")) 
-        s_df = pd.read_csv(os.path.join(VALIDATION_DIR, "clean_steps.csv")) # Load steps
+        r_df = _read_clean("clean_recipe.csv", dtype=RECIPE_DTYPES)
+        i_df = _read_clean("clean_interactions.csv", usecols=INTERACTION_COLUMNS, dtype=INTERACTION_DTYPES)
+        ing_df = _read_clean("clean_ingredients.csv", usecols=INGREDIENT_COLUMNS)
+        u_df = _read_clean("clean_users.csv", dtype=USER_DTYPES)
+        s_df = _read_clean("clean_steps.csv", usecols=STEP_COLUMNS) # Load steps
         return r_df, i_df, ing_df, u_df, s_df
     except FileNotFoundError as e:
         logger.error(f"Clean data not found. Run validation.py first. Error: {e}")
         raise
 
+#  shared aggregates
+def count_by_recipe_and_type(i_df) -> pd.DataFrame:
+    """
+    recipe x type interaction counts (the groupby(["recipe_id", "type"],
+    observed=True).size().unstack(fill_value=0) frame, types in category
+    order), built as one np.bincount histogram over factorized recipe codes
+    and categorical type codes.
+    """
+    type_codes = i_df["type"].cat.codes.to_numpy()
+    valid = (type_codes >= 0) & i_df["recipe_id"].notna().to_numpy()
+    recipe_codes, recipe_ids = pd.factorize(i_df["recipe_id"].to_numpy()[valid], sort=True)
+    types = i_df["type"].cat.categories
+    counts = np.bincount(recipe_codes * len(types) + type_codes[valid],
+                         minlength=len(recipe_ids) * len(types)).reshape(len(recipe_ids), len(types))
+    observed = counts.any(axis=0)  # only types that occur, like observed=True
+    return pd.DataFrame(counts[:, observed],
+                        index=pd.Index(recipe_ids, name="recipe_id"),
+                        columns=pd.Index(types[observed], name="type"))
+
 #  insights 
+# each insight does its aggregation in-process and queues a chart job
+# (plot function, small data, filename, figsize) onto `charts`; main renders
+# all queued charts in parallel worker processes (see render_charts)
 
 #  most common ingredients
-def insight_common_ingredients(ing_df):
-    common = ing_df["name"].value_counts().head(5)
-    fig, ax = plt.subplots(figsize=(8, 5))
+def insight_common_ingredients(ing_df, charts):
+    common = ing_df["name"].value_counts(sort=False).nlargest(5)
+    charts.append((plot_common_ingredients, common, "01_common_ingredients.png", (8, 5)))
+    return common.to_dict()
+
+def plot_common_ingredients(ax, common):
     common.sort_values().plot(kind='barh', color='green', ax=ax)
     ax.set_title("1. Top 5 Most Common Ingredients")
     ax.set_xlabel("Count")
     ax.set_ylabel("Ingredient Name")
-    save_chart(fig, "01_common_ingredients.png")
-    return common.to_dict()
 
 #  average preparation time
-def insight_prep_time(r_df):
+def insight_prep_time(r_df, charts):
     avg_time = r_df["prep_time_minutes"].mean()
-    fig, ax = plt.subplots(figsize=(6, 4))
-    r_df["prep_time_minutes"].hist(bins=10, ax=ax, color='teal')
+    charts.append((plot_prep_time, (r_df["prep_time_minutes"], avg_time), "02_prep_time_dist.png", (6, 4)))
+    return {"average_prep_time_minutes": avg_time}
+
+def plot_prep_time(ax, data):
+    prep_times, avg_time = data
+    prep_times.hist(bins=10, ax=ax, figure=ax.figure, color='teal')
     ax.axvline(avg_time, color='red', linestyle='dashed', linewidth=1)
     ax.text(avg_time + 5, ax.get_ylim()[1]*0.8, f'Avg: {avg_time:.1f} min', color='red')
     ax.set_title("2. Recipe Preparation Time Distribution")
     ax.set_xlabel("Preparation Time (minutes)")
     ax.set_ylabel("Number of Recipes")
-    save_chart(fig, "02_prep_time_dist.png")
-    return {"average_prep_time_minutes": avg_time}
 
 #  difficulty distribution
-def insight_difficulty(r_df):
+def insight_difficulty(r_df, charts):
     difficulty_order = ["Easy", "Medium", "Hard"]
     dist = r_df["difficulty"].value_counts().reindex(difficulty_order, fill_value=0)
-    fig, ax = plt.subplots(figsize=(6, 6))
+    charts.append((plot_difficulty, dist, "03_difficulty_distribution.png", (6, 6)))
+    return dist.to_dict()
+
+def plot_difficulty(ax, dist):
     ax.pie(dist, labels=dist.index, autopct='%1.1f%%', startangle=90, colors=['#4CAF50', '#FFC107', '#F44336'])
     ax.set_title("3. Recipe Difficulty Distribution")
-    save_chart(fig, "03_difficulty_distribution.png")
-    return dist.to_dict()
 
 #  correlation between prep time and likes
-def insight_prep_vs_likes(r_df, i_df):
-    likes = i_df[i_df["type"] == "like"].groupby("recipe_id").size().reset_index(name="like_count")
-    merged = r_df.merge(likes, on="recipe_id", how="left").fillna(0)
+def insight_prep_vs_likes(r_df, rec_by_type, charts):
+    likes = rec_by_type["like"].reset_index(name="like_count")
+    merged = _fill_zero(r_df.merge(likes, on="recipe_id", how="left"))
     correlation = merged["prep_time_minutes"].corr(merged["like_count"])
-    
-    fig, ax = plt.subplots(figsize=(8, 6))
+    charts.append((plot_prep_vs_likes, (merged[["prep_time_minutes", "like_count"]], correlation),
+                   "04_prep_vs_likes.png", (8, 6)))
+    return {"correlation_prep_time_likes": correlation}
+
+def plot_prep_vs_likes(ax, data):
+    merged, correlation = data
     ax.scatter(merged["prep_time_minutes"], merged["like_count"], alpha=0.6, color='purple')
     ax.set_title(f"4. Prep Time vs. Likes (Correlation: {correlation:.2f})")
     ax.set_xlabel("Preparation Time (minutes)")
     ax.set_ylabel("Total Likes")
-    save_chart(fig, "04_prep_vs_likes.png")
-    return {"correlation_prep_time_likes": correlation}
 
 # most frequently viewed recipes
-def insight_top_views(r_df, i_df):
-    views = i_df[i_df["type"] == "view"].groupby("recipe_id").size().reset_index(name="view_count")
+def insight_top_views(r_df, rec_by_type, charts):
+    views = rec_by_type["view"]
+    views = views[views > 0].reset_index(name="view_count")
     top_views = r_df.merge(views, on="recipe_id").sort_values("view_count", ascending=False).head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    top_views = top_views[["name", "view_count"]]
+    charts.append((plot_top_views, top_views, "05_top_views.png", (8, 5)))
+    return top_views.to_dict(orient="records")
+
+def plot_top_views(ax, top_views):
     top_views.sort_values("view_count").plot(kind='barh', x='name', y='view_count', legend=False, color='orange', ax=ax)
     ax.set_title("5. Top 5 Most Viewed Recipes")
     ax.set_xlabel("View Count")
     ax.set_ylabel("Recipe Name")
-    save_chart(fig, "05_top_views.png")
-    return top_views[["name", "view_count"]].to_dict(orient="records")
 
 #  ingredients associated with high engagement
-def insight_high_engagement_ingredients(r_df, i_df, ing_df):
-    engagement = i_df[i_df["type"].isin(["like", "cook_attempt", "rating"])].groupby("recipe_id").size().reset_index(name="engagement_score")
-    top_recipes = engagement.sort_values("engagement_score", ascending=False).head(5)["recipe_id"].tolist()
-    
-    top_ing = ing_df[ing_df["recipe_id"].isin(top_recipes)]["name"].value_counts().head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+def insight_high_engagement_ingredients(rec_by_type, ing_df, ing_rows_by_recipe, charts):
+    engagement = rec_by_type[["like", "cook_attempt", "rating"]].sum(axis=1)
+    engagement = engagement[engagement > 0].reset_index(name="engagement_score")
+    top_recipes = engagement.nlargest(5, "engagement_score")["recipe_id"].tolist()
+    
+    # look up the top recipes' ingredient rows instead of scanning ing_df (kept in file order)
+    rows = [ing_rows_by_recipe[rid] for rid in top_recipes if rid in ing_rows_by_recipe]
+    rows = np.sort(np.concatenate(rows)) if rows else np.array([], dtype=np.intp)
+    top_ing = ing_df["name"].iloc[rows].value_counts(sort=False).nlargest(5)
+    charts.append((plot_high_engagement_ingredients, top_ing, "06_high_engagement_ingredients.png", (8, 5)))
+    return top_ing.to_dict()
+
+def plot_high_engagement_ingredients(ax, top_ing):
     top_ing.sort_values().plot(kind='barh', color='red', ax=ax)
     ax.set_title("6. Top Ingredients in High-Engagement Recipes")
     ax.set_xlabel("Ingredient Count")
     ax.set_ylabel("Ingredient Name")
-    save_chart(fig, "06_high_engagement_ingredients.png")
-    return top_ing.to_dict()
 
 #  funnel (View -> Like -> Cook Attempt)
-def insight_conversion_funnel(i_df):
-    views = i_df[i_df["type"] == "view"].shape[0]
-    likes = i_df[i_df["type"] == "like"].shape[0]
-    cooks = i_df[i_df["type"] == "cook_attempt"].shape[0]
+def insight_conversion_funnel(rec_by_type, charts):
+    totals = rec_by_type.sum()
+    views = int(totals["view"])
+    likes = int(totals["like"])
+    cooks = int(totals["cook_attempt"])
     
-    data = [views, likes, cooks]
+    charts.append((plot_conversion_funnel, [views, likes, cooks], "07_interaction_funnel.png", (6, 4)))
+    return {"view_count": views, "like_count": likes, "cook_attempt_count": cooks}
+
+def plot_conversion_funnel(ax, data):
     labels = ["View", "Like", "Cook Attempt"]
-    
-    fig, ax = plt.subplots(figsize=(6, 4))
     ax.bar(labels, data, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
     ax.set_title("7. User Interaction Funnel")
     ax.set_ylabel("Count")
-    save_chart(fig, "07_interaction_funnel.png")
-    
-    return {"view_count": views, "like_count": likes, "cook_attempt_count": cooks}
 
 #  user Segments (e.g., Low, Medium, High Engager)
-def insight_user_segments(i_df):
-    engagement = i_df.groupby("user_id").size().reset_index(name="total_interactions")
+def insight_user_segments(user_counts, charts):
+    engagement = user_counts.reset_index(name="total_interactions")
     
-    bins = [0, engagement["total_interactions"].quantile(0.33), engagement["total_interactions"].quantile(0.66), engagement["total_interactions"].max() + 1]
+    # both cut points from one quantile call (a single sort of the counts)
+    q33, q66 = engagement["total_interactions"].quantile([0.33, 0.66]).to_numpy()
+    bins = [0, q33, q66, engagement["total_interactions"].max() + 1]
     labels = ["Low Engager", "Medium Engager", "High Engager"]
     engagement["segment"] = pd.cut(engagement["total_interactions"], bins=bins, labels=labels, right=False)
     
     segments = engagement["segment"].value_counts().reindex(labels, fill_value=0)
-    
-    fig, ax = plt.subplots(figsize=(7, 7))
+    charts.append((plot_user_segments, segments, "08_user_segments.png", (7, 7)))
+    return segments.to_dict()
+
+def plot_user_segments(ax, segments):
     ax.pie(segments, labels=segments.index, autopct='%1.1f%%', startangle=90, colors=['#a6cee3', '#1f78b4', '#b2df8a'])
     ax.set_title("8. User Engagement Segments")
-    save_chart(fig, "08_user_segments.png")
-    return segments.to_dict()
 
 #  average Rating by Difficulty
-def insight_rating_by_difficulty(r_df, i_df):
-    ratings = i_df[i_df["type"] == "rating"].dropna(subset=["rating"])
+def insight_rating_by_difficulty(r_df, i_df, type_masks, charts):
+    ratings = i_df[type_masks["rating"]].dropna(subset=["rating"])
     merged = r_df.merge(ratings, on="recipe_id", how="inner")
     
     difficulty_order = ["Easy", "Medium", "Hard"]
-    avg_rating = merged.groupby("difficulty")["rating"].mean().reindex(difficulty_order)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    avg_rating = merged.groupby("difficulty", observed=True)["rating"].mean().reindex(difficulty_order)
+    charts.append((plot_rating_by_difficulty, avg_rating, "09_rating_by_difficulty.png", (8, 5)))
+    return avg_rating.to_dict()
+
+def plot_rating_by_difficulty(ax, avg_rating):
     avg_rating.plot(kind='bar', color=['#4CAF50', '#FFC107', '#F44336'], ax=ax)
     ax.set_title("9. Average Rating by Recipe Difficulty")
     ax.set_ylabel("Average Rating (1-5)")
     ax.tick_params(axis='x', rotation=0)
-    save_chart(fig, "09_rating_by_difficulty.png")
-    
-    return avg_rating.to_dict()
 
 #  cook Time Statistics
-def insight_cook_time(r_df):
+def insight_cook_time(r_df, charts):
     cook_stats = r_df["cook_time_minutes"].describe().to_dict()
-    
-    fig, ax = plt.subplots(figsize=(6, 4))
-    r_df["cook_time_minutes"].hist(bins=10, ax=ax, color='sienna')
+    charts.append((plot_cook_time, r_df["cook_time_minutes"], "10_cook_time_dist.png", (6, 4)))
+    return cook_stats
+
+def plot_cook_time(ax, cook_times):
+    cook_times.hist(bins=10, ax=ax, figure=ax.figure, color='sienna')
     ax.set_title("10. Recipe Cook Time Distribution")
     ax.set_xlabel("Cook Time (minutes)")
     ax.set_ylabel("Number of Recipes")
-    save_chart(fig, "10_cook_time_dist.png")
-    return cook_stats
 
 #  top Cities for Cooking (Cook Attempts)
-def insight_top_cities_cooking(i_df, u_df):
-    cooks = i_df[i_df["type"] == "cook_attempt"]
+def insight_top_cities_cooking(i_df, u_df, type_masks, charts):
+    cooks = i_df[type_masks["cook_attempt"]]
     merged = cooks.merge(u_df, on="user_id", how="inner")
-    top_cities = merged["city"].value_counts().head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    # drop cities with no cook attempts (categorical counts include every category)
+    top_cities = _top_counts(merged["city"])
+    charts.append((plot_top_cities_cooking, top_cities, "11_top_cities_cooking.png", (8, 5)))
+    return top_cities.to_dict()
+
+def plot_top_cities_cooking(ax, top_cities):
     top_cities.sort_values().plot(kind='barh', color='indigo', ax=ax)
     ax.set_title("11. Top 5 Cities by Cook Attempts")
     ax.set_xlabel("Total Cook Attempts")
     ax.set_ylabel("City")
-    save_chart(fig, "11_top_cities_cooking.png")
-    return top_cities.to_dict()
 
 #  weighted Popularity Score
-def insight_popularity_score(r_df, i_df):
-    # weights: view=1, like=5, cook=10, rating=2
-    weights = {"view": 1, "like": 5, "cook_attempt": 10, "rating": 2}
-    
-    popularity = i_df.copy()
-    popularity["score"] = popularity["type"].map(weights)
-    popularity_sum = popularity.groupby("recipe_id")["score"].sum().reset_index(name="popularity_score")
-    
+def insight_popularity_score(r_df, popularity_sum, charts):
     merged = r_df.merge(popularity_sum, on="recipe_id").sort_values("popularity_score", ascending=False).head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    merged = merged[["name", "popularity_score"]]
+    charts.append((plot_popularity_score, merged, "12_weighted_popularity.png", (8, 5)))
+    return merged.to_dict(orient="records")
+
+def plot_popularity_score(ax, merged):
     merged.sort_values("popularity_score").plot(kind='barh', x='name', y='popularity_score', legend=False, color='goldenrod', ax=ax)
     ax.set_title("12. Top 5 Recipes by Weighted Popularity Score")
     ax.set_xlabel("Popularity Score")
     ax.set_ylabel("Recipe Name")
-    save_chart(fig, "12_weighted_popularity.png")
-    return merged[["name", "popularity_score"]].to_dict(orient="records")
 
 # average steps by  difficulty
-def insight_steps_by_difficulty(r_df, s_df): 
+def insight_steps_by_difficulty(r_df, s_df, charts): 
     """Insight: Do Harder recipes have more steps? (Uses steps DF: s_df)"""
     # group steps data by recipe_id and find the maximum step_no (total steps)
     steps_per_recipe = s_df.groupby("recipe_id")["step_no"].max().reset_index(name="total_steps")
@@ -238,52 +348,58 @@ def insight_steps_by_difficulty(r_df, s_df):
     
     # ensure order is consistent
     difficulty_order = ["Easy", "Medium", "Hard"]
-    avg_steps = merged.groupby("difficulty")["total_steps"].mean().reindex(difficulty_order)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    avg_steps = merged.groupby("difficulty", observed=True)["total_steps"].mean().reindex(difficulty_order)
+    charts.append((plot_steps_by_difficulty, avg_steps, "13_steps_by_difficulty.png", (8, 5)))
+    return avg_steps.to_dict()
+
+def plot_steps_by_difficulty(ax, avg_steps):
     avg_steps.plot(kind='bar', color='darkblue', ax=ax)
     ax.set_title("13. Average Steps by Difficulty")
     ax.set_ylabel("Average Total Steps")
     ax.tick_params(axis='x', rotation=0)
-    save_chart(fig, "13_steps_by_difficulty.png")
-    
-    return avg_steps.to_dict()
 
 #  engagement by Cuisine
-def insight_engagement_by_cuisine(r_df, i_df):
-    i_df_non_view = i_df[i_df["type"] != "view"]
+def insight_engagement_by_cuisine(r_df, i_df, type_masks, charts):
+    i_df_non_view = i_df[~type_masks["view"]]
     engagement = i_df_non_view.groupby("recipe_id").size().reset_index(name="engagement_count")
     merged = r_df.merge(engagement, on="recipe_id", how="inner")
     
-    # explode cuisines and group
-    merged_cuisines = merged.assign(cuisines=merged['cuisines'].str.split('|')).explode('cuisines')
-    merged_cuisines['cuisines'] = merged_cuisines['cuisines'].str.strip()
+    # flatten cuisines without explode: split once, then repeat each recipe's
+    # engagement count by its number of cuisines
+    parts = merged["cuisines"].dropna().str.split("|")
+    lens = parts.str.len().to_numpy()
+    flat = np.concatenate(parts.to_numpy()).astype(str) if len(parts) else np.array([], dtype=str)
+    merged_cuisines = pd.DataFrame({
+        "cuisines": np.char.strip(flat),
+        "engagement_count": np.repeat(merged.loc[parts.index, "engagement_count"].to_numpy(), lens),
+    })
     
     cuisine_engagement = merged_cuisines.groupby("cuisines")["engagement_count"].sum().sort_values(ascending=False).head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+    charts.append((plot_engagement_by_cuisine, cuisine_engagement, "14_engagement_by_cuisine.png", (8, 5)))
+    return cuisine_engagement.to_dict()
+
+def plot_engagement_by_cuisine(ax, cuisine_engagement):
     cuisine_engagement.sort_values().plot(kind='barh', color='olivedrab', ax=ax)
     ax.set_title("14. Total Engagement by Cuisine")
     ax.set_xlabel("Total Non-View Engagement")
     ax.set_ylabel("Cuisine")
-    save_chart(fig, "14_engagement_by_cuisine.png")
-    return cuisine_engagement.to_dict()
 
 #  user State Distribution (Top 5)
-def insight_user_state_dist(u_df):
-    state_dist = u_df["state"].value_counts().head(5)
-    
-    fig, ax = plt.subplots(figsize=(8, 5))
+def insight_user_state_dist(u_df, charts):
+    state_dist = _top_counts(u_df["state"])
+    charts.append((plot_user_state_dist, state_dist, "15_user_state_distribution.png", (8, 5)))
+    return state_dist.to_dict()
+
+def plot_user_state_dist(ax, state_dist):
     state_dist.sort_values().plot(kind='barh', color='firebrick', ax=ax)
     ax.set_title("15. Top 5 User State Distribution")
     ax.set_xlabel("User Count")
     ax.set_ylabel("State")
-    save_chart(fig, "15_user_state_distribution.png")
-    return state_dist.to_dict()
 
 #  main function
 def main():
     logger.info("Loading Clean Data for Analytics...")
+    ensure_output_dirs()
     # loading 5 dataframes: r_df, i_df, ing_df, u_df, s_df (recipes, interactions, ingredients, users, steps)
     try:
         r_df, i_df, ing_df, u_df, s_df = load_clean_data()
@@ -291,43 +407,51 @@ def main():
         logger.error(f"Failed to load clean data. Aborting analytics. Error: {e}")
         return
 
+    # shared aggregates: one pass over interactions feeds every count-based insight
+    type_counts = count_by_recipe_and_type(i_df)
+    rec_by_type = type_counts.reindex(columns=INTERACTION_TYPES, fill_value=0)
+    user_counts = i_df.groupby("user_id").size()
+    # recipe_id -> positional rows of its ingredients
+    ing_rows_by_recipe = ing_df.groupby("recipe_id", sort=False).indices
+    # row masks per interaction type, for the insights that filter raw interactions
+    type_masks = {t: (i_df["type"] == t).to_numpy() for t in INTERACTION_TYPES}
+
     # data preparation for summary tables
-    top_views = insight_top_views(r_df, i_df)
-    
     # interaction summary
-    interaction_counts = i_df.groupby(["recipe_id", "type"]).size().unstack(fill_value=0).reset_index()
+    interaction_counts = type_counts.reset_index()
     
     # user engagement summary (total interactions per user)
-    user_engagement = i_df.groupby("user_id").size().reset_index(name="total_interactions")
-    engagement_df = u_df.merge(user_engagement, on="user_id", how="left").fillna(0)
+    user_engagement = user_counts.reset_index(name="total_interactions")
+    engagement_df = _fill_zero(u_df.merge(user_engagement, on="user_id", how="left"))
     
-    # popularity summary (using Insight 12 logic for a CSV output)
-    weights = {"view": 1, "like": 5, "cook_attempt": 10, "rating": 2}
-    popularity = i_df.copy()
-    popularity["score"] = popularity["type"].map(weights)
-    popularity_sum = popularity.groupby("recipe_id")["score"].sum().reset_index(name="popularity_score")
+    # popularity summary, shared with Insight 12
+    # weights: view=1, like=5, cook=10, rating=2 -> one dot product over the per-type counts
+    popularity_sum = (rec_by_type[INTERACTION_TYPES] @ POPULARITY_WEIGHTS).reset_index(name="popularity_score")
     popularity_df = r_df.merge(popularity_sum, on="recipe_id", how="left").fillna({"popularity_score": 0})
     
     # insights generation
     logger.info("Generating 15 Insights & Visualizations...")
     
     insights = {}
-    
-    insights["1_common_ingredients"] = insight_common_ingredients(ing_df)
-    insights["2_avg_prep_time"] = insight_prep_time(r_df)
-    insights["3_difficulty_dist"] = insight_difficulty(r_df)
-    insights["4_prep_likes_corr"] = insight_prep_vs_likes(r_df, i_df)
-    insights["5_top_viewed"] = insight_top_views(r_df, i_df)
-    insights["6_high_engagement_ing"] = insight_high_engagement_ingredients(r_df, i_df, ing_df)
-    insights["7_funnel"] = insight_conversion_funnel(i_df)
-    insights["8_segments"] = insight_user_segments(i_df)
-    insights["9_rating_by_diff"] = insight_rating_by_difficulty(r_df, i_df)
-    insights["10_cook_time_stats"] = insight_cook_time(r_df)
-    insights["11_top_cities_cooking"] = insight_top_cities_cooking(i_df, u_df)
-    insights["12_weighted_popularity"] = insight_popularity_score(r_df, i_df)
-    insights["13_avg_steps_by_difficulty"] = insight_steps_by_difficulty(r_df, s_df) 
-    insights["14_engagement_by_cuisine"] = insight_engagement_by_cuisine(r_df, i_df)
-    insights["15_user_state_distribution"] = insight_user_state_dist(u_df)
+    charts = []
+    
+    insights["1_common_ingredients"] = insight_common_ingredients(ing_df, charts)
+    insights["2_avg_prep_time"] = insight_prep_time(r_df, charts)
+    insights["3_difficulty_dist"] = insight_difficulty(r_df, charts)
+    insights["4_prep_likes_corr"] = insight_prep_vs_likes(r_df, rec_by_type, charts)
+    insights["5_top_viewed"] = insight_top_views(r_df, rec_by_type, charts)
+    insights["6_high_engagement_ing"] = insight_high_engagement_ingredients(rec_by_type, ing_df, ing_rows_by_recipe, charts)
+    insights["7_funnel"] = insight_conversion_funnel(rec_by_type, charts)
+    insights["8_segments"] = insight_user_segments(user_counts, charts)
+    insights["9_rating_by_diff"] = insight_rating_by_difficulty(r_df, i_df, type_masks, charts)
+    insights["10_cook_time_stats"] = insight_cook_time(r_df, charts)
+    insights["11_top_cities_cooking"] = insight_top_cities_cooking(i_df, u_df, type_masks, charts)
+    insights["12_weighted_popularity"] = insight_popularity_score(r_df, popularity_sum, charts)
+    insights["13_avg_steps_by_difficulty"] = insight_steps_by_difficulty(r_df, s_df, charts)
+    insights["14_engagement_by_cuisine"] = insight_engagement_by_cuisine(r_df, i_df, type_masks, charts)
+    insights["15_user_state_distribution"] = insight_user_state_dist(u_df, charts)
+
+    render_charts(charts)
 
     logger.info(f"Analytics Generation Complete. Report and charts in {ANALYTICS_DIR}")
 
@@ -337,7 +461,7 @@ def main():
         "total_recipes_clean": len(r_df),
         "total_users_clean": len(u_df),
         "total_interactions_clean": len(i_df),
-        "top_views_summary": top_views, 
+        "top_views_summary": insights["5_top_viewed"], 
         "user_engagement_summary": engagement_df.to_dict(orient="records"),
         "popularity_summary": popularity_df[["recipe_id", "name", "popularity_score"]].sort_values("popularity_score", ascending=False).head(10).to_dict(orient="records"),
         "interaction_summary": interaction_counts.to_dict(orient="records"),
@@ -345,9 +469,9 @@ def main():
         "assignment_pdf_path": ASSIGNMENT_PDF_PATH
     }
 
-    # save JSON report
-    with open(os.path.join(ANALYTICS_DIR, ANALYTICS_FILE), "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, default=str)
+    # save JSON report (orjson encodes numpy scalars natively; anything else falls back to str)
+    with open(os.path.join(ANALYTICS_DIR, ANALYTICS_FILE), "wb") as f:
+        f.write(orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
 
     # save auxiliary CSVs
     top_views_df = pd.DataFrame(insights["5_top_viewed"])
@@ -26,23 +26,33 @@ Outputs (per run, in a new version folder):
 """
 
 import os
+import csv
 import shutil
+import queue
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-import firebase_admin
-from firebase_admin import credentials, firestore
-
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from utils import (
-    SERVICE_ACCOUNT_PATH,
-    PROJECT_ID,
     OUTPUT_DIR,
+    get_db,
     get_logger,
+    list_version_dirs,
 )
 
 logger = get_logger("ETL_Pipeline")
 
 # checkpoint file to track last successful ETL time (UTC)
 CHECKPOINT_FILE = os.path.join(OUTPUT_DIR, "etl_checkpoint.txt")
+# documents pulled off a Firestore stream before they are normalized
+FETCH_BATCH_SIZE = 10_000
+# batches a collection stream may fetch ahead of normalization
+PREFETCH_BATCHES = 2
+# rows converted to Arrow (and written) at a time by _write_csv
+CSV_WRITE_CHUNK_ROWS = 50_000
 
 
 #  helpers- checkpoint, firestore init, version discovery
@@ -55,7 +65,9 @@ def get_last_run_timestamp():
             value = f.read().strip()
         if not value:
             return None
-        return datetime.datetime.fromisoformat(value)
+        ts = datetime.datetime.fromisoformat(value)
+        # checkpoints written before timestamps were tz-aware are naive UTC
+        return ts if ts.tzinfo else ts.replace(tzinfo=datetime.timezone.utc)
     except Exception as e:
         logger.warning(f"Failed to parse checkpoint file, running full extract. Error: {e}")
         return None
@@ -72,62 +84,38 @@ def save_last_run_timestamp(ts: datetime.datetime):
         logger.error(f"Failed to write checkpoint file: {e}")
 
 
-def init_firestore():
-    """Initializes Firebase app if not already initialized."""
-    if not firebase_admin._apps:
-        cred = credentials.Certificate(SERVICE_ACCOUNT_PATH)
-        firebase_admin.initialize_app(cred, {"projectId": PROJECT_ID})
-    return firestore.client()
-
-
-def _list_version_dirs():
-    """Returns list of (version_number:int, full_path:str) for ETL_Output/vN_* dirs."""
-    if not os.path.exists(OUTPUT_DIR):
-        return []
-
-    results = []
-    for name in os.listdir(OUTPUT_DIR):
-        full_path = os.path.join(OUTPUT_DIR, name)
-        if not os.path.isdir(full_path):
-            continue
-        if not name.startswith("v") or "_" not in name:
-            # ignore non-version folders, e.g. Backup, etc.
-            continue
-        prefix = name.split("_", 1)[0]  # 'v1'
-        try:
-            num = int(prefix[1:])
-            results.append((num, full_path))
-        except ValueError:
-            continue
-    return results
-
-
-def get_latest_version_dir():
-    """Returns the latest version directory path under OUTPUT_DIR, or None."""
-    versions = _list_version_dirs()
+def get_latest_version_dir(versions=None):
+    """
+    Returns the latest version directory path under OUTPUT_DIR, or None.
+    Pass a list_version_dirs() result to reuse an earlier scan.
+    """
+    if versions is None:
+        versions = list_version_dirs()
     if not versions:
         return None
-    versions.sort(key=lambda x: x[0])  # sort by version number
     return versions[-1][1]  # path of highest version
 
 
-def create_new_version_dir():
+def create_new_version_dir(versions=None):
     """
     Creates a new ETL version directory:
         v{N}_{timestamp}
 
+    Pass a list_version_dirs() result to reuse an earlier scan.
+
     Returns:
         (new_version_path, new_version_name, new_version_number)
     """
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    versions = _list_version_dirs()
+    if versions is None:
+        versions = list_version_dirs()
     if versions:
         max_num = max(v[0] for v in versions)
     else:
         max_num = 0
 
     new_num = max_num + 1
-    ts_str = datetime.datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
+    ts_str = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
     folder_name = f"v{new_num}_{ts_str}"
     full_path = os.path.join(OUTPUT_DIR, folder_name)
 
@@ -141,6 +129,10 @@ def backup_previous_version(prev_path: str | None):
     Copies the previous version directory into:
         ETL_Output/Backup/<same_folder_name>/
 
+    Version files are never modified after they are written, so the backup
+    hardlinks them (no data copied); falls back to a real copy where links
+    are not possible (e.g. different filesystem).
+
     Does nothing if prev_path is None.
     """
     if not prev_path:
@@ -157,13 +149,58 @@ def backup_previous_version(prev_path: str | None):
         return
 
     try:
-        shutil.copytree(prev_path, dest)
+        try:
+            shutil.copytree(prev_path, dest, copy_function=os.link)
+        except OSError:
+            shutil.rmtree(dest, ignore_errors=True)
+            shutil.copytree(prev_path, dest)
         logger.info(f"Backed up previous ETL version to: Backup/{name}")
     except Exception as e:
         logger.warning(f"Failed to backup previous version {name}: {e}")
 
 
 #  Firestore fetch (full or incremental)
+def _iter_batches(query, batch_size: int = FETCH_BATCH_SIZE):
+    """Streams a query's documents as lists of at most batch_size dicts."""
+    batch = []
+    for doc in query.stream():
+        batch.append(doc.to_dict())
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+_END_OF_STREAM = object()
+
+
+def _prefetched(batches, depth: int = PREFETCH_BATCHES):
+    """
+    Pulls `batches` in a producer thread through a bounded queue, so the
+    next batch is fetched from Firestore while the current one is being
+    normalized. Producer errors are re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+
+    def produce():
+        try:
+            for batch in batches:
+                buffer.put(batch)
+            buffer.put(_END_OF_STREAM)
+        except BaseException as e:
+            buffer.put(e)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is _END_OF_STREAM:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
 def fetch_firestore_data(last_run_ts=None):
     """
     Extracts raw collections from Firestore.
@@ -172,33 +209,36 @@ def fetch_firestore_data(last_run_ts=None):
         - Full extract (all documents).
     Else:
         - Incremental extract (documents where updated_at > last_run_ts).
+
+    Each collection is returned as a lazy stream of document batches, so the
+    whole collection is never held as raw dicts at once; each stream fetches
+    up to PREFETCH_BATCHES batches ahead in a background thread, and
+    normalize_and_save consumes the three streams concurrently.
     """
-    db = init_firestore()
+    db = get_db()
     logger.info("Fetching collections from Firestore...")
 
+    # only the fields normalization reads cross the network
+    recipes_ref = db.collection("recipes").select(RECIPE_FIELDS)
+    users_ref = db.collection("users").select(USER_COLUMNS)
+    interactions_ref = db.collection("interactions").select(INTERACTION_COLUMNS)
+
     if last_run_ts is None:
         logger.info("No checkpoint found → FULL extract from Firestore.")
-        recipes_ref = db.collection("recipes")
-        users_ref = db.collection("users")
-        interactions_ref = db.collection("interactions")
     else:
         logger.info(
             f"Checkpoint found ({last_run_ts.isoformat()}) → INCREMENTAL extract (updated_at > checkpoint)."
         )
-        recipes_ref = db.collection("recipes").where("updated_at", ">", last_run_ts)
-        users_ref = db.collection("users").where("updated_at", ">", last_run_ts)
-        interactions_ref = db.collection("interactions").where("updated_at", ">", last_run_ts)
-
-    recipes = [doc.to_dict() for doc in recipes_ref.stream()]
-    users = [doc.to_dict() for doc in users_ref.stream()]
-    interactions = [doc.to_dict() for doc in interactions_ref.stream()]
-
-    logger.info(
-        f"Fetched from Firestore → recipes: {len(recipes)}, users: {len(users)}, interactions: {len(interactions)}"
+        recipes_ref = recipes_ref.where("updated_at", ">", last_run_ts)
+        users_ref = users_ref.where("updated_at", ">", last_run_ts)
+        interactions_ref = interactions_ref.where("updated_at", ">", last_run_ts)
+
+    return (
+        _prefetched(_iter_batches(recipes_ref)),
+        _prefetched(_iter_batches(users_ref)),
+        _prefetched(_iter_batches(interactions_ref)),
     )
 
-    return recipes, users, interactions
-
 
 def merge_with_existing(df_new: pd.DataFrame,
                         prev_dir: str | None,
@@ -210,8 +250,9 @@ def merge_with_existing(df_new: pd.DataFrame,
 
     - If incremental=True and prev_dir exists and file exists:
         - Load previous CSV.
-        - Append new rows.
-        - Drop duplicates on key_columns (keep last).
+        - Keep previous rows whose key is not shadowed by a new row.
+        - Append new rows (last occurrence per key wins, as with
+          concat + drop_duplicates(keep="last")).
     - Else:
         - Return df_new as is.
     """
@@ -219,10 +260,19 @@ def merge_with_existing(df_new: pd.DataFrame,
         existing_path = os.path.join(prev_dir, filename)
         if os.path.exists(existing_path):
             try:
-                df_existing = pd.read_csv(existing_path)
-                combined = pd.concat([df_existing, df_new], ignore_index=True)
+                # pyarrow parser; timestamp stays text (as in df_new) instead of
+                # being inferred as datetime
+                df_existing = pd.read_csv(existing_path, engine="pyarrow", dtype={"timestamp": str})
                 if key_columns:
-                    combined = combined.drop_duplicates(subset=key_columns, keep="last")
+                    # probe old keys against the (small) set of new keys and
+                    # concat only the survivors, instead of hashing the whole union
+                    existing_keys = _key_index(df_existing, key_columns)
+                    new_keys = _key_index(df_new, key_columns)
+                    keep_existing = ~existing_keys.isin(new_keys) & ~existing_keys.duplicated(keep="last")
+                    keep_new = ~new_keys.duplicated(keep="last")
+                    combined = pd.concat([df_existing[keep_existing], df_new[keep_new]], ignore_index=True)
+                else:
+                    combined = pd.concat([df_existing, df_new], ignore_index=True)
                 logger.info(f"Merged incremental rows into {filename} from previous version.")
                 return combined
             except Exception as e:
@@ -231,8 +281,278 @@ def merge_with_existing(df_new: pd.DataFrame,
     return df_new
 
 
+def _key_index(df: pd.DataFrame, key_columns) -> pd.MultiIndex:
+    return pd.MultiIndex.from_frame(df[key_columns])
+
+
+def _can_append(df_new: pd.DataFrame, existing_path: str, key_columns) -> bool:
+    """
+    True when df_new only adds rows to the previous snapshot: same header,
+    no key already present there and no duplicate keys on either side. In
+    that case concat + drop_duplicates would just be the old rows followed
+    by the new ones.
+    """
+    with open(existing_path, "r", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if header != list(df_new.columns):
+        return False
+    if not key_columns or df_new.empty:
+        return True
+    existing_keys = pd.read_csv(existing_path, engine="pyarrow", usecols=key_columns)
+    new_index = _key_index(df_new, key_columns)
+    existing_index = _key_index(existing_keys, key_columns)
+    if new_index.has_duplicates or existing_index.has_duplicates:
+        return False
+    return not new_index.isin(existing_index).any()
+
+
+def _pandas_spelled(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Float and bool columns as the strings to_csv writes for them ('10.0',
+    'True'); Arrow would write 10 and true. NaN stays null (an empty cell).
+    """
+    out = {}
+    for name, s in df.items():
+        values = s.to_numpy()
+        if values.dtype.kind == "f":
+            text = values.astype(str).astype(object)
+            text[np.isnan(values)] = None
+            out[name] = text
+        elif values.dtype.kind == "b":
+            out[name] = np.where(values, "True", "False").astype(object)
+        else:
+            out[name] = values
+    return pd.DataFrame(out, index=df.index, columns=df.columns)
+
+
+def _write_csv(df: pd.DataFrame, path: str, append: bool = False):
+    """
+    Writes df with Arrow's multi-threaded CSV writer (header only when not
+    appending), in the same format to_csv produces, so appended rows match
+    files pandas wrote earlier. Rows are converted CSV_WRITE_CHUNK_ROWS at a
+    time against one schema, so only a chunk of the table is ever copied into
+    Arrow. Columns Arrow can't type (mixed objects), or values that to_csv
+    would quote, fall back to to_csv for the whole write.
+    """
+    # to_csv quotes an empty single-column row (""), which Arrow can't reproduce
+    if len(df.columns) < 2:
+        df.to_csv(path, mode="a" if append else "w", header=not append, index=False)
+        return
+
+    with open(path, "ab" if append else "wb") as f:
+        start = f.tell()
+        try:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            # float/bool columns are written as _pandas_spelled strings
+            for i, field in enumerate(schema):
+                if pa.types.is_floating(field.type) or pa.types.is_boolean(field.type):
+                    schema = schema.set(i, pa.field(field.name, pa.string()))
+            write_options = pa_csv.WriteOptions(
+                include_header=not append,
+                eol=os.linesep,
+                # quoting 'none' raises on values containing , \" or line breaks,
+                # which are exactly the ones to_csv would quote
+                quoting_style="none",
+                quoting_header="none",
+            )
+            with pa_csv.CSVWriter(f, schema, write_options=write_options) as writer:
+                for lo in range(0, len(df), CSV_WRITE_CHUNK_ROWS):
+                    chunk = _pandas_spelled(df.iloc[lo:lo + CSV_WRITE_CHUNK_ROWS])
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # drop whatever Arrow wrote before failing, then redo it in pandas
+            f.seek(start)
+            f.truncate()
+    df.to_csv(path, mode="a" if append else "w", header=not append, index=False)
+
+
+def save_snapshot(df_new: pd.DataFrame,
+                  prev_dir: str | None,
+                  new_dir: str,
+                  filename: str,
+                  key_columns,
+                  incremental: bool):
+    """
+    Writes one table into the new version folder.
+
+    - Incremental run whose delta only adds new keys:
+        - Copy the previous snapshot file byte-for-byte.
+        - Append just the delta rows (history is never re-parsed/re-written).
+    - Otherwise:
+        - merge_with_existing + full CSV write.
+    """
+    dest = os.path.join(new_dir, filename)
+    existing_path = os.path.join(prev_dir, filename) if incremental and prev_dir else None
+
+    if existing_path and os.path.exists(existing_path):
+        try:
+            if _can_append(df_new, existing_path, key_columns):
+                shutil.copyfile(existing_path, dest)
+                _write_csv(df_new, dest, append=True)
+                logger.info(f"Appended {len(df_new)} incremental rows to {filename} from previous version.")
+                return
+        except Exception as e:
+            logger.warning(f"Append-only write failed for {filename}, falling back to full merge. Error: {e}")
+
+    df_final = merge_with_existing(df_new, prev_dir, filename, key_columns, incremental)
+    _write_csv(df_final, dest)
+
+
 #  normalization & saving (per-version)
 
+# output columns per table (also the CSV column order)
+RECIPE_COLUMNS = [
+    "recipe_id", "name", "description", "prep_time_minutes", "cook_time_minutes",
+    "difficulty", "servings", "tags", "cuisines",
+]
+INGREDIENT_COLUMNS = ["ingredient_id", "recipe_id", "name", "quantity", "unit"]
+STEP_COLUMNS = ["recipe_id", "step_no", "instruction", "duration_minutes"]
+INTERACTION_COLUMNS = ["interaction_id", "user_id", "recipe_id", "type", "rating", "like", "timestamp"]
+USER_COLUMNS = ["user_id", "name", "city", "state", "country", "email"]
+# Firestore field projection per collection: exactly what normalization reads
+# (recipes also carry the nested ingredients/steps arrays)
+RECIPE_FIELDS = RECIPE_COLUMNS + ["ingredients", "steps"]
+
+
+# marks fields missing from a Firestore doc, as opposed to ones stored as null
+_ABSENT = object()
+
+
+def _flatten(docs, columns, record_path=None) -> pd.DataFrame:
+    """
+    Flattens Firestore dicts into a DataFrame holding exactly `columns`.
+
+    With record_path, rows come from that nested array of every doc and the
+    parent recipe_id is attached (docs without the array contribute nothing).
+    Fields absent from the source become _ABSENT and are defaulted by the
+    caller; explicit nulls stay None.
+
+    Built column-wise (one list per column) rather than from row dicts.
+    """
+    parent_ids = None
+    if record_path is not None:
+        records, parent_ids = [], []
+        for d in docs:
+            items = d.get(record_path)
+            if items:
+                records.extend(items)
+                parent_ids.extend([d.get("recipe_id")] * len(items))
+        docs = records
+
+    data = {c: [d.get(c, _ABSENT) for d in docs] for c in columns}
+    if parent_ids is not None:
+        data["recipe_id"] = pd.Series(parent_ids, dtype=object)
+    return pd.DataFrame(data, columns=columns)
+
+
+def _fill_absent(s: pd.Series, default) -> pd.Series:
+    """Column-wise equivalent of doc.get(field, default): only absent fields get default."""
+    # masked assignment stores the one default object in every absent slot;
+    # where()/fillna() would materialize a fresh copy of it per row
+    values = s.to_numpy(dtype=object, copy=True)
+    values[np.fromiter((v is _ABSENT for v in values), dtype=bool, count=len(values))] = default
+    return pd.Series(values, index=s.index, dtype=object)
+
+
+def _str_col(s: pd.Series, default=None) -> pd.Series:
+    """Column-wise equivalent of str(doc.get(field, default)); explicit None -> 'None'."""
+    return _fill_absent(s, default).astype(str)
+
+
+def _join_col(s: pd.Series) -> pd.Series:
+    """Joins array fields into '|' separated strings ('' when absent or null)."""
+    return _fill_absent(s, None).str.join("|").fillna("")
+
+
+def _num_col(s: pd.Series, default) -> pd.Series:
+    """
+    Defaults absent numbers, keeping whole-number columns integral. Explicit
+    nulls and non-numeric values become NaN, so validation quarantines them.
+    """
+    return pd.to_numeric(_fill_absent(s, default), errors="coerce", downcast="integer")
+
+
+def _normalize_recipes(docs):
+    """Recipe docs → (recipe, ingredients, steps) frames."""
+    recipe_df = _flatten(docs, RECIPE_COLUMNS)
+    recipe_df_new = pd.DataFrame({
+        "recipe_id": _str_col(recipe_df["recipe_id"]),
+        "name": _str_col(recipe_df["name"]),
+        "description": _str_col(recipe_df["description"], ""),
+        "prep_time_minutes": _num_col(recipe_df["prep_time_minutes"], 0),
+        "cook_time_minutes": _num_col(recipe_df["cook_time_minutes"], 0),
+        "difficulty": _str_col(recipe_df["difficulty"], "Unknown"),
+        "servings": _num_col(recipe_df["servings"], 1),
+        "tags": _join_col(recipe_df["tags"]),
+        "cuisines": _join_col(recipe_df["cuisines"]),
+    })
+
+    # ingredients/steps are exploded straight out of the nested arrays,
+    # carrying the parent recipe_id along as metadata
+    ing_df = _flatten(docs, INGREDIENT_COLUMNS, record_path="ingredients")
+    ing_df_new = pd.DataFrame({
+        "ingredient_id": _str_col(ing_df["ingredient_id"]),
+        "recipe_id": _str_col(ing_df["recipe_id"]),
+        "name": _str_col(ing_df["name"]),
+        "quantity": _fill_absent(ing_df["quantity"], 0).infer_objects(),
+        "unit": _str_col(ing_df["unit"], ""),
+    })
+
+    steps_df = _flatten(docs, STEP_COLUMNS, record_path="steps")
+    steps_df_new = pd.DataFrame({
+        "recipe_id": _str_col(steps_df["recipe_id"]),
+        # int columns: an explicit null (or non-number) has no integer form, so it falls back to 0 too
+        "step_no": _num_col(steps_df["step_no"], 0).fillna(0).astype(int),
+        "instruction": _str_col(steps_df["instruction"], ""),
+        "duration_minutes": _num_col(steps_df["duration_minutes"], 0).fillna(0).astype(int),
+    })
+    return recipe_df_new, ing_df_new, steps_df_new
+
+
+def _normalize_interactions(docs):
+    """Interaction docs → (interactions,) frame."""
+    it_df = _flatten(docs, INTERACTION_COLUMNS)
+    rating = pd.to_numeric(_fill_absent(it_df["rating"], None), errors="coerce")
+    like = _fill_absent(it_df["like"], None)
+    interactions_df_new = pd.DataFrame({
+        "interaction_id": _str_col(it_df["interaction_id"]),
+        "user_id": _str_col(it_df["user_id"]),
+        "recipe_id": _str_col(it_df["recipe_id"]),
+        "type": _str_col(it_df["type"]),
+        "rating": rating.where(rating != 0),  # falsy ratings (missing/0) stay empty
+        "like": like.notna() & like.astype(bool),
+        "timestamp": _str_col(it_df["timestamp"]),
+    })
+    return (interactions_df_new,)
+
+
+def _normalize_users(docs):
+    """User docs → (users,) frame."""
+    u_df = _flatten(docs, USER_COLUMNS)
+    users_df_new = pd.DataFrame({
+        "user_id": _str_col(u_df["user_id"]),
+        "name": _str_col(u_df["name"]),
+        "city": _str_col(u_df["city"], "Unknown"),
+        "state": _str_col(u_df["state"], "Unknown"),
+        "country": _str_col(u_df["country"], "Unknown"),
+        "email": _str_col(u_df["email"], ""),
+    })
+    return (users_df_new,)
+
+
+def _normalize_stream(batches, normalize):
+    """
+    Normalizes each raw batch as it arrives and concatenates the resulting
+    (much smaller) frames, so only one batch of raw dicts is alive at a time.
+    """
+    parts = [normalize(batch) for batch in batches] or [normalize([])]
+    return tuple(
+        frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        for frames in zip(*parts)
+    )
+
+
 def normalize_and_save(recipes,
                        users,
                        interactions,
@@ -240,75 +560,23 @@ def normalize_and_save(recipes,
                        prev_version_dir: str | None,
                        new_version_dir: str):
     """
-    Transforms nested JSON into flat, normalized CSV tables, merges with
+    Transforms nested JSON (streams of doc batches, see fetch_firestore_data)
+    into flat, normalized CSV tables, merges with
     previous ETL snapshot (if incremental), and writes new snapshot into
     a fresh version directory.
     """
     logger.info("Normalizing data...")
 
-    recipe_rows = []
-    ingredients_rows = []
-    steps_rows = []
-
-    #  process recipes, ingredients, steps ---
-    for r in recipes:
-        recipe_rows.append({
-            "recipe_id": str(r.get("recipe_id")),
-            "name": str(r.get("name")),
-            "description": str(r.get("description", "")),
-            "prep_time_minutes": r.get("prep_time_minutes", 0),
-            "cook_time_minutes": r.get("cook_time_minutes", 0),
-            "difficulty": str(r.get("difficulty", "Unknown")),
-            "servings": r.get("servings", 1),
-            "tags": "|".join(r.get("tags", [])),
-            "cuisines": "|".join(r.get("cuisines", []))
-        })
-
-        for ing in r.get("ingredients", []):
-            ingredients_rows.append({
-                "ingredient_id": str(ing.get("ingredient_id")),
-                "recipe_id": str(r.get("recipe_id")),
-                "name": str(ing.get("name")),
-                "quantity": ing.get("quantity", 0),
-                "unit": str(ing.get("unit", ""))
-            })
-
-        for st in r.get("steps", []):
-            steps_rows.append({
-                "recipe_id": str(r.get("recipe_id")),
-                "step_no": int(st.get("step_no", 0)),
-                "instruction": str(st.get("instruction", "")),
-                "duration_minutes": int(st.get("duration_minutes", 0))
-            })
-
-    interactions_rows = []
-    for it in interactions:
-        interactions_rows.append({
-            "interaction_id": str(it.get("interaction_id")),
-            "user_id": str(it.get("user_id")),
-            "recipe_id": str(it.get("recipe_id")),
-            "type": str(it.get("type")),
-            "rating": float(it.get("rating")) if it.get("rating") else None,
-            "like": bool(it.get("like")) if it.get("like") is not None else False,
-            "timestamp": str(it.get("timestamp"))
-        })
-
-    users_rows = []
-    for u in users:
-        users_rows.append({
-            "user_id": str(u.get("user_id")),
-            "name": str(u.get("name")),
-            "city": str(u.get("city", "Unknown")),
-            "state": str(u.get("state", "Unknown")),
-            "country": str(u.get("country", "Unknown")),
-            "email": str(u.get("email", ""))
-        })
-
-    recipe_df_new = pd.DataFrame(recipe_rows)
-    ing_df_new = pd.DataFrame(ingredients_rows)
-    steps_df_new = pd.DataFrame(steps_rows)
-    interactions_df_new = pd.DataFrame(interactions_rows)
-    users_df_new = pd.DataFrame(users_rows)
+    # the three collection streams are independent and bound by Firestore
+    # round-trips, so they are pulled (and normalized) in parallel threads
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        recipes_future = executor.submit(_normalize_stream, recipes, _normalize_recipes)
+        interactions_future = executor.submit(_normalize_stream, interactions, _normalize_interactions)
+        users_future = executor.submit(_normalize_stream, users, _normalize_users)
+
+        recipe_df_new, ing_df_new, steps_df_new = recipes_future.result()
+        (interactions_df_new,) = interactions_future.result()
+        (users_df_new,) = users_future.result()
 
     logger.info(
         f"New rows → recipes: {len(recipe_df_new)}, ingredients: {len(ing_df_new)}, "
@@ -319,27 +587,23 @@ def normalize_and_save(recipes,
     os.makedirs(new_version_dir, exist_ok=True)
 
     # merge with existing (previous version) if incremental, then save
-    recipe_df_final = merge_with_existing(
-        recipe_df_new, prev_version_dir, "recipe.csv", ["recipe_id"], incremental
-    )
-    ing_df_final = merge_with_existing(
-        ing_df_new, prev_version_dir, "ingredients.csv", ["ingredient_id"], incremental
-    )
-    steps_df_final = merge_with_existing(
-        steps_df_new, prev_version_dir, "steps.csv", ["recipe_id", "step_no"], incremental
-    )
-    interactions_df_final = merge_with_existing(
-        interactions_df_new, prev_version_dir, "interactions.csv", ["interaction_id"], incremental
-    )
-    users_df_final = merge_with_existing(
-        users_df_new, prev_version_dir, "users.csv", ["user_id"], incremental
-    )
-
-    recipe_df_final.to_csv(os.path.join(new_version_dir, "recipe.csv"), index=False)
-    ing_df_final.to_csv(os.path.join(new_version_dir, "ingredients.csv"), index=False)
-    steps_df_final.to_csv(os.path.join(new_version_dir, "steps.csv"), index=False)
-    interactions_df_final.to_csv(os.path.join(new_version_dir, "interactions.csv"), index=False)
-    users_df_final.to_csv(os.path.join(new_version_dir, "users.csv"), index=False)
+    tables = [
+        (recipe_df_new, "recipe.csv", ["recipe_id"]),
+        (ing_df_new, "ingredients.csv", ["ingredient_id"]),
+        (steps_df_new, "steps.csv", ["recipe_id", "step_no"]),
+        (interactions_df_new, "interactions.csv", ["interaction_id"]),
+        (users_df_new, "users.csv", ["user_id"]),
+    ]
+    # the five tables are independent; CSV encoding and disk writes run
+    # outside the GIL, so they overlap across threads
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        futures = [
+            executor.submit(save_snapshot, df_new, prev_version_dir, new_version_dir,
+                            filename, key_columns, incremental)
+            for df_new, filename, key_columns in tables
+        ]
+        for future in futures:
+            future.result()  # re-raise any write error
 
     logger.info(f"ETL CSVs written to version folder: {os.path.basename(new_version_dir)}")
 
@@ -349,13 +613,15 @@ def normalize_and_save(recipes,
 def main():
     try:
         last_ts = get_last_run_timestamp()
-        prev_version_dir = get_latest_version_dir()
+        # scan ETL_Output once; both the latest and the next version come from it
+        versions = list_version_dirs()
+        prev_version_dir = get_latest_version_dir(versions)
 
         # backup previous version (if any)
         backup_previous_version(prev_version_dir)
 
         # prepare new version folder
-        new_version_dir, folder_name, version_num = create_new_version_dir()
+        new_version_dir, folder_name, version_num = create_new_version_dir(versions)
 
         incremental = last_ts is not None and prev_version_dir is not None
         if incremental:
@@ -377,7 +643,7 @@ def main():
         )
 
         # update checkpoint to NOW
-        save_last_run_timestamp(datetime.datetime.utcnow())
+        save_last_run_timestamp(datetime.datetime.now(datetime.timezone.utc))
         logger.info("ETL normalization + versioned export complete.")
 
     except Exception as e:
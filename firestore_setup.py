@@ -16,18 +16,29 @@ Notes:
 """
 
 
-import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import firestore_async
+import os
+import asyncio
 import random
+import numpy as np
 import datetime
 from utils import (
-    SERVICE_ACCOUNT_PATH, PROJECT_ID, get_logger, normalize_id
+    get_db, get_logger, normalize_id
 )
 
 logger = get_logger("FirestoreSetup")
 
 NUM_USERS = 30
 NUM_INTERACTIONS = 400
+# document writes kept in flight at once by write_documents
+MAX_CONCURRENT_WRITES = 50
+# attempts per BulkWriter write before it gives up on it
+BULK_WRITE_MAX_ATTEMPTS = 5
+# main() skips seeding when the last complete seed is younger than this (0 = always seed)
+SEED_MAX_AGE_DAYS = int(os.getenv("SEED_MAX_AGE_DAYS", "1"))
+# marker doc written only once every seed write has succeeded
+SEED_MARKER_COLLECTION = "meta"
+SEED_MARKER_DOC = "seed"
 
 
 # users 
@@ -51,9 +62,13 @@ USER_NAMES = [
     "Manish Mehta", "Divya Mishra", "Karthik Khan", "Shreya Naik", "Neha Kulkarni"
 ]
 
+# constant lookups for the user seeding loop
+LOCATION_STATES = list(LOCATIONS)
+USER_IDS = [normalize_id(name) for name in USER_NAMES]
+
 
 def now_utc():
-    return datetime.datetime.utcnow()
+    return datetime.datetime.now(datetime.timezone.utc)
 
 
 # primary recipe — idli sambar
@@ -389,10 +404,31 @@ REALISTIC_RECIPES = [
     },
 ]
 
+# document ids of the synthetic recipes (the recipe list is constant)
+REALISTIC_RECIPE_IDS = [normalize_id(r["name"]) for r in REALISTIC_RECIPES]
+
 # --------------------------------------------------------
 # BAD DATA INJECTION FOR TESTING
 # --------------------------------------------------------
-def inject_bad_data(db, user_ids, recipe_ids):
+async def write_documents(docs):
+    """
+    Writes (collection, doc_id, data) tuples concurrently on the async
+    Firestore client, with at most MAX_CONCURRENT_WRITES requests in flight.
+    """
+    db = firestore_async.client()
+    limit = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+    # one reference per collection, shared by all of its documents
+    collections = {name: db.collection(name) for name in {doc[0] for doc in docs}}
+
+    async def write(collection, doc_id, data):
+        async with limit:
+            await collections[collection].document(doc_id).set(data)
+
+    await asyncio.gather(*(write(*doc) for doc in docs))
+
+
+def inject_bad_data(db, bulk_writer, user_ids, recipe_ids):
+    """Queues the invalid test documents on the caller's BulkWriter (sent on its close)."""
     logger.warning("Injecting invalid test data...")
 
     ts = now_utc()
@@ -422,35 +458,43 @@ def inject_bad_data(db, user_ids, recipe_ids):
         "updated_at": ts
     }
 
-    db.collection("recipes").document(bad_recipe["recipe_id"]).set(bad_recipe)
-    db.collection("interactions").document(bad_inter["interaction_id"]).set(bad_inter)
+    bulk_writer.set(db.collection("recipes").document(bad_recipe["recipe_id"]), bad_recipe)
+    bulk_writer.set(db.collection("interactions").document(bad_inter["interaction_id"]), bad_inter)
+
+
+def _seed_marker(db):
+    return db.collection(SEED_MARKER_COLLECTION).document(SEED_MARKER_DOC)
+
+
+def recently_seeded(db) -> bool:
+    """True when a complete seed finished less than SEED_MAX_AGE_DAYS ago."""
+    snap = _seed_marker(db).get(field_paths=["completed_at"])
+    completed_at = snap.to_dict().get("completed_at") if snap.exists else None
+    return completed_at is not None and (now_utc() - completed_at).days < SEED_MAX_AGE_DAYS
 
 
 # main function
 def main():
     try:
-        if not firebase_admin._apps:
-            cred = credentials.Certificate(SERVICE_ACCOUNT_PATH)
-            firebase_admin.initialize_app(cred, {"projectId": PROJECT_ID})
-
-        db = firestore.client()
+        db = get_db()
+        # one point read instead of re-writing every seed document
+        if recently_seeded(db):
+            logger.info(f"Skipping seed: Firestore was seeded less than {SEED_MAX_AGE_DAYS} day(s) ago.")
+            return
         ts = now_utc()
+        # recipe and user docs are collected here and written concurrently below
+        docs = []
 
         # primary recipe 
         logger.info("Adding Primary Recipe: Idli Sambar")
         recipe_doc = IDLI_SAMBAR.copy()
         recipe_doc["created_at"] = ts
         recipe_doc["updated_at"] = ts
-        db.collection("recipes").document(recipe_doc["recipe_id"]).set(recipe_doc)
+        docs.append(("recipes", recipe_doc["recipe_id"], recipe_doc))
 
         # synthetic Recipes 
         logger.info("Adding Synthetic Recipes...")
-        synthetic_ids = []
-
-        for rec in REALISTIC_RECIPES:
-            rid = normalize_id(rec["name"])
-            synthetic_ids.append(rid)
-
+        for rid, rec in zip(REALISTIC_RECIPE_IDS, REALISTIC_RECIPES):
             ingredients = [
                 {
                     "ingredient_id": f"{rid}_ing_{i}",
@@ -470,7 +514,7 @@ def main():
                 for i, step in enumerate(rec["steps"])
             ]
 
-            db.collection("recipes").document(rid).set({
+            docs.append(("recipes", rid, {
                 "recipe_id": rid,
                 "name": rec["name"],
                 "description": f"{rec['name']} recipe",
@@ -484,20 +528,15 @@ def main():
                 "steps": steps,
                 "created_at": ts,
                 "updated_at": ts
-            })
+            }))
 
         # users 
         logger.info("Adding Users...")
-        user_ids = []
-
-        for i, name in enumerate(USER_NAMES):
-            uid = normalize_id(name)
-            user_ids.append(uid)
-
-            state = random.choice(list(LOCATIONS.keys()))
+        for i, (uid, name) in enumerate(zip(USER_IDS, USER_NAMES)):
+            state = random.choice(LOCATION_STATES)
             city = random.choice(LOCATIONS[state])
 
-            db.collection("users").document(uid).set({
+            docs.append(("users", uid, {
                 "user_id": uid,
                 "name": name,
                 "city": city,
@@ -506,48 +545,65 @@ def main():
                 "email": f"user{i}@example.com",
                 "created_at": ts,
                 "updated_at": ts
-            })
+            }))
+
+        asyncio.run(write_documents(docs))
 
         # interactions 
         logger.info("Adding Interactions...")
-        all_recipes = synthetic_ids + [recipe_doc["recipe_id"]]
-
-        batch = db.batch()
-        bcount = 0
-
-        for i in range(NUM_INTERACTIONS):
-            t = random.choice(["view", "like", "cook_attempt", "rating"])
-            rec_id = random.choice(all_recipes)
-            uid = random.choice(user_ids)
-
+        all_recipes = REALISTIC_RECIPE_IDS + [recipe_doc["recipe_id"]]
+
+        # BulkWriter batches, parallelizes and rate-limits the writes itself,
+        # retrying transient failures; writes that still fail are collected
+        bulk_writer = db.bulk_writer()
+        failed_writes = []
+
+        def on_write_error(error, _writer) -> bool:
+            if error.attempts < BULK_WRITE_MAX_ATTEMPTS:
+                return True
+            failed_writes.append(error)
+            return False
+
+        bulk_writer.on_write_error(on_write_error)
+        interactions_col = db.collection("interactions")
+
+        # sample every interaction's type/recipe/user/rating up front in one
+        # numpy call each (tolist() hands Firestore plain Python values)
+        types = np.random.choice(["view", "like", "cook_attempt", "rating"], size=NUM_INTERACTIONS).tolist()
+        rec_ids = np.random.choice(all_recipes, size=NUM_INTERACTIONS).tolist()
+        uids = np.random.choice(USER_IDS, size=NUM_INTERACTIONS).tolist()
+        ratings = np.random.randint(1, 6, size=NUM_INTERACTIONS).tolist()
+
+        for i, (t, rec_id, uid, rating) in enumerate(zip(types, rec_ids, uids, ratings)):
             inter = {
                 "interaction_id": f"int_{i:04d}",
                 "user_id": uid,
                 "recipe_id": rec_id,
                 "type": t,
-                "rating": random.randint(1, 5) if t == "rating" else None,
+                "rating": rating if t == "rating" else None,
                 "like": True if t == "like" else None,
                 "timestamp": ts,
                 "created_at": ts,
                 "updated_at": ts,
             }
 
-            batch.set(
-                db.collection("interactions").document(inter["interaction_id"]),
+            bulk_writer.set(
+                interactions_col.document(inter["interaction_id"]),
                 inter
             )
-            bcount += 1
 
-            if bcount == 400:
-                batch.commit()
-                batch = db.batch()
-                bcount = 0
+        # bad data injection, sent with the interactions
+        inject_bad_data(db, bulk_writer, USER_IDS, all_recipes)
 
-        if bcount > 0:
-            batch.commit()
+        bulk_writer.close()
+        if failed_writes:
+            raise RuntimeError(
+                f"{len(failed_writes)} seed writes failed, first: {failed_writes[0].message}"
+            )
 
-        # bad data injection
-        inject_bad_data(db, user_ids, all_recipes)
+        # only a fully written seed counts for recently_seeded(); a failed
+        # run above leaves the previous (stale or missing) marker in place
+        _seed_marker(db).set({"completed_at": now_utc()})
 
         logger.info("Firestore setup complete!")
 
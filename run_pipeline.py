@@ -13,6 +13,8 @@ deterministic pipeline execution.
 Usage:
     python run_pipeline.py
         → Full pipeline INCLUDING Firestore seeding (first time).
+          Seeding is skipped automatically if it last completed within
+          SEED_MAX_AGE_DAYS (default 1); set SEED_MAX_AGE_DAYS=0 to force it.
 
     python run_pipeline.py --no-seed
         → Skip Firestore seeding, start from ETL stage
@@ -23,10 +25,7 @@ Usage:
 import time
 import sys
 
-import firestore_setup
-import etl_export_transform
-import validation
-import analytics
+# stage modules are imported inside run(), only for the stages that run
 from utils import get_logger
 
 logger = get_logger("Orchestrator")
@@ -42,6 +41,7 @@ def run(seed_firestore: bool = True):
     # step 1: optional seed data
     if seed_firestore:
         logger.info(">>> [STEP 1/4] SEEDING FIRESTORE")
+        import firestore_setup
         firestore_setup.main()
         print("-" * 30)
     else:
@@ -51,16 +51,19 @@ def run(seed_firestore: bool = True):
 
     # step 2: extract & transform
     logger.info(">>> [STEP 2/4] ETL (EXTRACT & TRANSFORM)")
+    import etl_export_transform
     etl_export_transform.main()
     print("-" * 30)
 
     # step 3: validation (quality gate)
     logger.info(">>> [STEP 3/4] DATA VALIDATION & QUARANTINE")
+    import validation
     validation.main()
     print("-" * 30)
 
     # step 4: analytics & visualization
     logger.info(">>> [STEP 4/4] ANALYTICS GENERATION")
+    import analytics
     analytics.main()
 
     elapsed = time.time() - start_time
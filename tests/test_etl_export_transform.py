@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from etl_export_transform import _normalize_recipes, _normalize_users, _normalize_interactions, _write_csv
+
+
+def test_recipes_absent_fields_get_defaults_explicit_nulls_stay_missing():
+    docs = [
+        {"recipe_id": "absent", "name": "A", "ingredients": [{"ingredient_id": "i1", "name": "salt"}]},
+        {"recipe_id": "nulls", "name": "N", "description": None,
+         "prep_time_minutes": None, "cook_time_minutes": None, "servings": None,
+         "difficulty": None, "tags": None,
+         "ingredients": [{"ingredient_id": "i2", "name": "oil", "quantity": None, "unit": None}]},
+        {"recipe_id": "full", "name": "F", "description": "d",
+         "prep_time_minutes": 5, "cook_time_minutes": 10, "servings": 2,
+         "difficulty": "Easy", "tags": ["a", "b"]},
+    ]
+    recipes, ingredients, _ = _normalize_recipes(docs)
+    recipes = recipes.set_index("recipe_id")
+
+    assert recipes.loc["absent", ["prep_time_minutes", "cook_time_minutes", "servings"]].tolist() == [0, 0, 1]
+    assert recipes.loc["absent", "description"] == ""
+    assert recipes.loc["absent", "difficulty"] == "Unknown"
+    assert recipes.loc["absent", "tags"] == ""
+
+    assert recipes.loc["nulls", ["prep_time_minutes", "cook_time_minutes", "servings"]].isna().all()
+    assert recipes.loc["nulls", "description"] == "None"
+    assert recipes.loc["nulls", "difficulty"] == "None"
+    assert recipes.loc["nulls", "tags"] == ""
+
+    assert recipes.loc["full", ["prep_time_minutes", "cook_time_minutes", "servings"]].tolist() == [5, 10, 2]
+    assert recipes.loc["full", "tags"] == "a|b"
+
+    ingredients = ingredients.set_index("ingredient_id")
+    assert ingredients.loc["i1", "quantity"] == 0
+    assert ingredients.loc["i1", "unit"] == ""
+    assert pd.isna(ingredients.loc["i2", "quantity"])
+    assert ingredients.loc["i2", "unit"] == "None"
+
+
+def test_recipes_non_numeric_values_become_missing_instead_of_raising():
+    docs = [
+        {"recipe_id": "bad", "name": "B", "prep_time_minutes": "abc", "cook_time_minutes": "n/a",
+         "servings": "two", "steps": [{"step_no": "x", "instruction": "stir", "duration_minutes": "?"}]},
+        {"recipe_id": "ok", "name": "O", "prep_time_minutes": 5, "cook_time_minutes": 10, "servings": 2,
+         "steps": [{"step_no": 1, "instruction": "boil", "duration_minutes": 3}]},
+    ]
+    recipes, _, steps = _normalize_recipes(docs)
+    recipes = recipes.set_index("recipe_id")
+
+    assert recipes.loc["bad", ["prep_time_minutes", "cook_time_minutes", "servings"]].isna().all()
+    assert recipes.loc["ok", ["prep_time_minutes", "cook_time_minutes", "servings"]].tolist() == [5, 10, 2]
+    assert steps[["step_no", "duration_minutes"]].values.tolist() == [[0, 0], [1, 3]]
+
+
+def test_users_explicit_null_is_not_defaulted():
+    (users,) = _normalize_users([
+        {"user_id": "u1", "name": "A"},
+        {"user_id": "u2", "name": "B", "city": None, "email": None},
+    ])
+    users = users.set_index("user_id")
+    assert users.loc["u1", ["city", "state", "country", "email"]].tolist() == ["Unknown", "Unknown", "Unknown", ""]
+    assert users.loc["u2", ["city", "state", "email"]].tolist() == ["None", "Unknown", "None"]
+
+
+def test_interactions_absent_and_null_rating_and_like():
+    (interactions,) = _normalize_interactions([
+        {"interaction_id": "a", "type": "view"},
+        {"interaction_id": "b", "type": "rating", "rating": None, "like": None},
+        {"interaction_id": "c", "type": "rating", "rating": 4, "like": True},
+    ])
+    interactions = interactions.set_index("interaction_id")
+    assert interactions["rating"].isna().tolist() == [True, True, False]
+    assert interactions["like"].tolist() == [False, False, True]
+    assert interactions.loc["a", "user_id"] == "None"
+
+
+def test_write_csv_matches_to_csv_including_appends(tmp_path):
+    df = pd.DataFrame({
+        "interaction_id": ["a", "b", "c"],
+        "rating": [5.0, np.nan, 10.0],
+        "like": [True, False, False],
+        "count": [1, 2, 3],
+        "note": ["plain", None, ""],
+    })
+    expected, actual = tmp_path / "pandas.csv", tmp_path / "arrow.csv"
+    df.to_csv(expected, index=False)
+    _write_csv(df, str(actual))
+    assert actual.read_bytes() == expected.read_bytes()
+
+    # rows appended to a pandas-written file keep its spelling (True, 10.0, no quotes)
+    df.to_csv(expected, mode="a", header=False, index=False)
+    _write_csv(df, str(actual), append=True)
+    assert actual.read_bytes() == expected.read_bytes()
+
+
+def test_write_csv_values_needing_quotes_fall_back_to_to_csv(tmp_path):
+    df = pd.DataFrame({"name": ["a,b", 'say "hi"'], "n": [1.5, 2.0]})
+    expected, actual = tmp_path / "pandas.csv", tmp_path / "arrow.csv"
+    df.to_csv(expected, index=False)
+    _write_csv(df, str(actual))
+    assert actual.read_bytes() == expected.read_bytes()
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import validation
+
+
+@pytest.fixture
+def validation_dir(tmp_path, monkeypatch):
+    out = tmp_path / "Validation_Output"
+    out.mkdir()
+    monkeypatch.setattr(validation, "VALIDATION_DIR", str(out))
+    return out
+
+
+def _run_users(path):
+    return validation._validate_file(validation.validate_users, str(path))
+
+
+def test_missing_user_id_copies_source_when_header_is_clean(tmp_path, validation_dir):
+    source = tmp_path / "users.csv"
+    source.write_text("uid,name\nu1,A\nu2,\n")
+
+    report, clean, quarantined = _run_users(source)
+
+    assert (report, clean, quarantined) == ([], 0, 2)
+    assert (validation_dir / "quarantined_users.csv").read_text() == source.read_text()
+    assert (validation_dir / "clean_users.csv").read_text() == "\n"
+
+
+def test_missing_user_id_rewrites_when_header_needs_stripping(tmp_path, validation_dir):
+    source = tmp_path / "users.csv"
+    source.write_text(" uid , name\nu1,A\n")
+
+    report, clean, quarantined = _run_users(source)
+
+    assert (report, clean, quarantined) == ([], 0, 1)
+    quarantine = validation_dir / "quarantined_users.csv"
+    assert quarantine.read_text().splitlines()[0] == "uid,name"
+    assert pd.read_csv(quarantine).to_dict("records") == [{"uid": "u1", "name": "A"}]
@@ -6,13 +6,15 @@ Includes:
     - Firebase project settings
     - Directory creation for ETL, validation, and analytics
     - Standardized logging setup
-    - Helper functions (ID normalization, timestamps)
+    - Shared Firestore client
+    - Helper functions (ID normalization, timestamps, ETL version folders)
 
 Used by all pipeline modules for consistent behavior and configuration.
 """
 
 import os
 import uuid
+import functools
 import datetime
 import logging
 
@@ -31,36 +33,72 @@ VALIDATION_DIR = os.path.join(BASE_DIR, "Validation_Output")
 ANALYTICS_DIR = os.path.join(BASE_DIR, "Analytics_Output")
 CHART_DIR = os.path.join(ANALYTICS_DIR, "Charts")
 
-# ensure all directories exist
-for d in [OUTPUT_DIR, VALIDATION_DIR, ANALYTICS_DIR, CHART_DIR]:
-    os.makedirs(d, exist_ok=True)
+# ensure all directories exist (called by the stages that write to them,
+# so importing utils has no filesystem side effects)
+@functools.lru_cache(maxsize=1)
+def ensure_output_dirs():
+    """creates the etl, validation and analytics output directories once per process."""
+    for d in [OUTPUT_DIR, VALIDATION_DIR, ANALYTICS_DIR, CHART_DIR]:
+        os.makedirs(d, exist_ok=True)
 
 # logging
+# configured once on the root logger; named loggers propagate to its handler
+# (basicConfig is a no-op when an embedding application already set one up)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 def get_logger(name):
-    """creates a standardized logger with timestamp and level."""
-    logger = logging.getLogger(name)
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        
-        logger.addHandler(handler)
-    return logger
+    """returns a named logger that writes through the shared root handler."""
+    return logging.getLogger(name)
+
+# firestore
+@functools.lru_cache(maxsize=1)
+def get_db():
+    """initializes the firebase app once and returns the shared firestore client."""
+    # imported here so modules that never touch firestore don't load the sdk
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(SERVICE_ACCOUNT_PATH)
+        firebase_admin.initialize_app(cred, {"projectId": PROJECT_ID})
+    return firestore.client()
 
 # helpers 
+# spaces become underscores; apostrophes, dots and commas are dropped
+_ID_TABLE = str.maketrans({" ": "_", "'": None, ".": None, ",": None})
+
 def normalize_id(text: str):
     """convert a string into a firestore-safe document ID."""
     if not text: return f"unknown_{uuid.uuid4().hex[:6]}"
-    return (
-        text.strip()
-        .lower()
-        .replace(" ", "_")
-        .replace("'", "")
-        .replace(".", "")
-        .replace(",", "")
-    )
+    return text.strip().lower().translate(_ID_TABLE)
 
 def now_iso():
-    return datetime.datetime.utcnow().isoformat() + "Z"
\ No newline at end of file
+    return datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+# etl version folders: vN_YYYY-mm-dd_HH-MM-SS
+def list_version_dirs(base_dir=OUTPUT_DIR):
+    """
+    Returns list of (version_number:int, full_path:str) for base_dir/vN_* dirs,
+    sorted by version number. One scandir pass; DirEntry.is_dir() reuses the
+    directory listing instead of a stat() per entry.
+    """
+    if not os.path.exists(base_dir):
+        return []
+
+    results = []
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            name = entry.name
+            if not name.startswith("v") or "_" not in name:
+                # ignore non-version folders, e.g. Backup, etc.
+                continue
+            prefix = name.split("_", 1)[0]  # 'v1'
+            try:
+                num = int(prefix[1:])
+                results.append((num, entry.path))
+            except ValueError:
+                continue
+    results.sort(key=lambda x: x[0])  # sort by version number
+    return results
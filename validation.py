@@ -19,22 +19,22 @@ Outputs:
 """
 
 import os
-import json
+import csv
+import shutil
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 
-from utils import get_logger, OUTPUT_DIR
+from utils import get_logger, ensure_output_dirs, list_version_dirs, OUTPUT_DIR, VALIDATION_DIR
 
 logger = get_logger("DataValidator")
 
 # base ETL folder 
 ETL_ROOT_DIR = OUTPUT_DIR
-VALIDATION_DIR = "Validation_Output"
 REPORT_FILE = "validation_report.json"
 
-os.makedirs(VALIDATION_DIR, exist_ok=True)
-
-# allowed values
+# allowed values (only str values can match, so columns are checked without str() casts)
 VALID_DIFFICULTIES = ["Easy", "Medium", "Hard"]
 VALID_TYPES = ["view", "like", "cook_attempt", "rating"]
 
@@ -44,265 +44,219 @@ def get_latest_etl_version_dir(base_dir: str) -> str | None:
     Returns full path to latest ETL version directory under base_dir,
     where version folders are named: vN_YYYY-mm-dd_HH-MM-SS.
     """
-    if not os.path.exists(base_dir):
+    versions = list_version_dirs(base_dir)
+    if not versions:
         return None
+    return versions[-1][1]
 
-    candidates = []
-    for name in os.listdir(base_dir):
-        full_path = os.path.join(base_dir, name)
-        if not os.path.isdir(full_path):
-            continue
-        if not name.startswith("v") or "_" not in name:
-            continue
-        prefix = name.split("_", 1)[0]  # 'v1'
-        try:
-            num = int(prefix[1:])
-            candidates.append((num, full_path))
-        except ValueError:
-            continue
-
-    if not candidates:
-        return None
 
-    candidates.sort(key=lambda x: x[0])
-    return candidates[-1][1]
+#  individual validators
+#
+# each validator evaluates its rules column-wise (one boolean mask per rule)
+# and only builds error text for the rows that fail
 
+def _column(df, name):
+    """df[name], or all-missing when the column is absent (row.get(name) -> None)."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
 
-#  individual validators
 
-def validate_recipes(df):
-    df.columns = df.columns.str.strip()
-    clean_df = df.copy()
-    quarantine_rows = []
-    report = []
+def _blank(s):
+    """Missing, or empty once str()-ed and stripped."""
+    return s.isna() | s.astype(str).str.strip().eq("")
 
-    for _, row in df.iterrows():
-        errors = []
-        is_valid = True
 
-        if pd.isna(row.get("name")) or str(row.get("name", "")).strip() == "":
-            errors.append("Missing or empty recipe name")
-            is_valid = False
-        if pd.isna(row.get("description")):
-            errors.append("Missing recipe description")
-            is_valid = False
+# shared by every valid row's report record (serialized as [])
+_NO_ERRORS = ()
 
-        if pd.isna(row.get("prep_time_minutes")) or row.get("prep_time_minutes", -1) < 0:
-            errors.append("prep_time_minutes must be non-negative")
-            is_valid = False
-        if pd.isna(row.get("cook_time_minutes")) or row.get("cook_time_minutes", -1) < 0:
-            errors.append("cook_time_minutes must be non-negative")
-            is_valid = False
 
-        if pd.isna(row.get("servings")) or row.get("servings", 0) <= 0:
-            errors.append("servings must be positive")
-            is_valid = False
+def _row_errors(checks):
+    """
+    checks: (mask, message, values) in report order, where message is a
+    format string filled with the row's entry of `values` (or fixed when
+    values is None). Returns (is_valid array, {row position: error list}),
+    with entries only for failing rows.
+    """
+    masks = np.column_stack([mask.to_numpy(dtype=bool) for mask, _, _ in checks])
+    errors = {}
+    for j, (_, message, values) in enumerate(checks):
+        failing = np.flatnonzero(masks[:, j])
+        if not len(failing):
+            continue
+        shown = values.tolist() if values is not None else None
+        for i in failing.tolist():
+            text = message if shown is None else message.format(shown[i])
+            errors.setdefault(i, []).append(text)
+    return ~masks.any(axis=1), errors
 
-        if str(row.get("difficulty")) not in VALID_DIFFICULTIES:
-            errors.append(f"Invalid difficulty value: {row.get('difficulty')}")
-            is_valid = False
 
-        record = {
-            "recipe_id": row["recipe_id"],
-            "is_valid": is_valid,
-            "errors": errors
-        }
-        report.append(record)
+def _report(ids, is_valid, errors):
+    """Per-row report records: {<id columns>..., is_valid, errors}."""
+    names = list(ids)
+    rows = zip(*(ids[name].tolist() for name in names), is_valid.tolist())
+    return [
+        {**dict(zip(names, row[:-1])), "is_valid": row[-1], "errors": errors.get(i, _NO_ERRORS)}
+        for i, row in enumerate(rows)
+    ]
 
-        if not is_valid:
-            quarantine_rows.append(row)
 
-    quarantine_df = pd.DataFrame(quarantine_rows)
-    clean_df = df[~df["recipe_id"].isin(quarantine_df.get("recipe_id", []))]
+def _save_split(df, is_valid, name, key=None):
+    """
+    Writes quarantined_<name>.csv / clean_<name>.csv and returns their row
+    counts. With key, clean rows also drop any row sharing a key with a
+    quarantined one.
+    """
+    quarantine_df = df[~is_valid]
+    clean_df = df[is_valid]
+    # quarantined rows always match their own key, so only the valid rows
+    # need the key check, and only when something was quarantined
+    if key is not None and len(quarantine_df):
+        clean_df = clean_df[~clean_df[key].isin(quarantine_df[key])]
 
-    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_recipe.csv"), index=False)
-    clean_df.to_csv(os.path.join(VALIDATION_DIR, "clean_recipe.csv"), index=False)
+    # nothing quarantined: the file is left empty (no header row)
+    if quarantine_df.empty:
+        quarantine_df = pd.DataFrame()
+    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, f"quarantined_{name}.csv"), index=False)
+    clean_df.to_csv(os.path.join(VALIDATION_DIR, f"clean_{name}.csv"), index=False)
 
-    return report, len(clean_df), len(quarantine_df)
+    return len(clean_df), len(quarantine_df)
 
 
-def validate_users(df):
+def validate_recipes(df):
     df.columns = df.columns.str.strip()
 
-    if 'user_id' not in df.columns:
-        logger.error(f"FATAL: 'user_id' column missing. Columns found: {list(df.columns)}")
-        quarantine_df = df.copy()
-        quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_users.csv"), index=False)
-        pd.DataFrame().to_csv(os.path.join(VALIDATION_DIR, "clean_users.csv"), index=False)
-        return [], 0, len(df)
+    prep = _column(df, "prep_time_minutes")
+    cook = _column(df, "cook_time_minutes")
+    servings = _column(df, "servings")
+    difficulty = _column(df, "difficulty")
 
-    quarantine_rows = []
-    report = []
+    is_valid, errors = _row_errors([
+        (_blank(_column(df, "name")), "Missing or empty recipe name", None),
+        (_column(df, "description").isna(), "Missing recipe description", None),
+        (prep.isna() | (prep < 0), "prep_time_minutes must be non-negative", None),
+        (cook.isna() | (cook < 0), "cook_time_minutes must be non-negative", None),
+        (servings.isna() | (servings <= 0), "servings must be positive", None),
+        (~difficulty.isin(VALID_DIFFICULTIES), "Invalid difficulty value: {}", difficulty),
+    ])
+    report = _report({"recipe_id": df["recipe_id"]}, is_valid, errors)
 
-    for _, row in df.iterrows():
-        errors = []
-        is_valid = True
+    clean, quarantined = _save_split(df, is_valid, "recipe", key="recipe_id")
+    return report, clean, quarantined
 
-        if pd.isna(row["user_id"]) or str(row["user_id"]).strip() == "":
-            errors.append("Missing user_id")
-            is_valid = False
 
-        if pd.isna(row["name"]) or str(row["name"]).strip() == "":
-            errors.append("Missing user name")
-            is_valid = False
+def _csv_header(path):
+    """The raw header row of a CSV file ([] when empty)."""
+    with open(path, newline="") as f:
+        return next(csv.reader(f), [])
 
-        record = {
-            "user_id": row["user_id"],
-            "is_valid": is_valid,
-            "errors": errors
-        }
-        report.append(record)
 
-        if not is_valid:
-            quarantine_rows.append(row)
+def validate_users(df, source_path=None):
+    df.columns = df.columns.str.strip()
 
-    quarantine_df = pd.DataFrame(quarantine_rows)
-    clean_df = df[~df["user_id"].isin(quarantine_df.get("user_id", []))]
+    if 'user_id' not in df.columns:
+        logger.error(f"FATAL: 'user_id' column missing. Columns found: {list(df.columns)}")
+        # the whole file is quarantined: copy it as-is rather than re-encode
+        # it, unless its header differs from the stripped column names
+        quarantine_path = os.path.join(VALIDATION_DIR, "quarantined_users.csv")
+        if source_path and _csv_header(source_path) == list(df.columns):
+            shutil.copyfile(source_path, quarantine_path)
+        else:
+            df.to_csv(quarantine_path, index=False)
+        pd.DataFrame().to_csv(os.path.join(VALIDATION_DIR, "clean_users.csv"), index=False)
+        return [], 0, len(df)
 
-    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_users.csv"), index=False)
-    clean_df.to_csv(os.path.join(VALIDATION_DIR, "clean_users.csv"), index=False)
+    is_valid, errors = _row_errors([
+        (_blank(df["user_id"]), "Missing user_id", None),
+        (_blank(df["name"]), "Missing user name", None),
+    ])
+    report = _report({"user_id": df["user_id"]}, is_valid, errors)
 
-    return report, len(clean_df), len(quarantine_df)
+    clean, quarantined = _save_split(df, is_valid, "users", key="user_id")
+    return report, clean, quarantined
 
 
 def validate_ingredients(df):
     df.columns = df.columns.str.strip()
-    clean_df = df.copy()
-    quarantine_rows = []
-    report = []
-
-    for _, row in df.iterrows():
-        errors = []
-        is_valid = True
-
-        if pd.isna(row.get("recipe_id")):
-            errors.append("Missing recipe_id link")
-            is_valid = False
-        if pd.isna(row.get("name")) or str(row.get("name", "")).strip() == "":
-            errors.append("Missing ingredient name")
-            is_valid = False
-
-        if pd.isna(row.get("quantity")) or row.get("quantity", 0) <= 0:
-            errors.append("Quantity must be positive")
-            is_valid = False
-
-        record = {
-            "ingredient_id": row["ingredient_id"],
-            "is_valid": is_valid,
-            "errors": errors
-        }
-        report.append(record)
 
-        if not is_valid:
-            quarantine_rows.append(row)
+    quantity = _column(df, "quantity")
 
-    quarantine_df = pd.DataFrame(quarantine_rows)
-    clean_df = df[~df["ingredient_id"].isin(quarantine_df.get("ingredient_id", []))]
+    is_valid, errors = _row_errors([
+        (_column(df, "recipe_id").isna(), "Missing recipe_id link", None),
+        (_blank(_column(df, "name")), "Missing ingredient name", None),
+        (quantity.isna() | (quantity <= 0), "Quantity must be positive", None),
+    ])
+    report = _report({"ingredient_id": df["ingredient_id"]}, is_valid, errors)
 
-    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_ingredients.csv"), index=False)
-    clean_df.to_csv(os.path.join(VALIDATION_DIR, "clean_ingredients.csv"), index=False)
-
-    return report, len(clean_df), len(quarantine_df)
+    clean, quarantined = _save_split(df, is_valid, "ingredients", key="ingredient_id")
+    return report, clean, quarantined
 
 
 def validate_steps(df):
     df.columns = df.columns.str.strip()
-    clean_df = df.copy()
-    quarantine_rows = []
-    report = []
-
-    for idx, row in df.iterrows():
-        errors = []
-        is_valid = True
-
-        if pd.isna(row.get("recipe_id")):
-            errors.append("Missing recipe_id link")
-            is_valid = False
-        if pd.isna(row.get("instruction")) or str(row.get("instruction", "")).strip() == "":
-            errors.append("Missing step instruction")
-            is_valid = False
-
-        if pd.isna(row.get("step_no")) or row.get("step_no", 0) <= 0:
-            errors.append("step_no must be positive")
-            is_valid = False
-        if pd.isna(row.get("duration_minutes")) or row.get("duration_minutes", -1) < 0:
-            errors.append("duration_minutes must be non-negative")
-            is_valid = False
-
-        record = {
-            "recipe_id": row["recipe_id"],
-            "step_no": row["step_no"],
-            "is_valid": is_valid,
-            "errors": errors
-        }
-        report.append(record)
 
-        if not is_valid:
-            quarantine_rows.append(row)
+    step_no = _column(df, "step_no")
+    duration = _column(df, "duration_minutes")
 
-    quarantine_df = pd.DataFrame(quarantine_rows)
-    quarantine_indices = quarantine_df.index.tolist()
-    clean_df = df[~df.index.isin(quarantine_indices)]
+    is_valid, errors = _row_errors([
+        (_column(df, "recipe_id").isna(), "Missing recipe_id link", None),
+        (_blank(_column(df, "instruction")), "Missing step instruction", None),
+        (step_no.isna() | (step_no <= 0), "step_no must be positive", None),
+        (duration.isna() | (duration < 0), "duration_minutes must be non-negative", None),
+    ])
+    report = _report({"recipe_id": df["recipe_id"], "step_no": df["step_no"]}, is_valid, errors)
 
-    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_steps.csv"), index=False)
-    clean_df.to_csv(os.path.join(VALIDATION_DIR, "clean_steps.csv"), index=False)
-
-    return report, len(clean_df), len(quarantine_rows)
+    # steps have no single id column; rows are split individually
+    clean, quarantined = _save_split(df, is_valid, "steps")
+    return report, clean, quarantined
 
 
 def validate_interactions(df):
     df.columns = df.columns.str.strip()
-    clean_df = df.copy()
-    quarantine_rows = []
-    report = []
-
-    for _, row in df.iterrows():
-        errors = []
-        is_valid = True
-
-        if pd.isna(row.get("user_id")):
-            errors.append("Missing user_id link")
-            is_valid = False
-        if pd.isna(row.get("recipe_id")):
-            errors.append("Missing recipe_id link")
-            is_valid = False
 
-        if str(row.get("type")) not in VALID_TYPES:
-            errors.append(f"Invalid interaction type: {row.get('type')}")
-            is_valid = False
+    interaction_type = _column(df, "type")
+    rating = _column(df, "rating")
+    # non-numeric ratings become NaN and fail the check instead of raising
+    rating_value = pd.to_numeric(rating, errors="coerce")
+    bad_rating = rating_value.isna() | (rating_value < 1) | (rating_value > 5)
 
-        if row.get("type") == "rating":
-            if pd.isna(row.get("rating")) or row.get("rating", 0) < 1 or row.get("rating", 6) > 5:
-                errors.append(f"Rating out of bounds or missing for rating type: {row.get('rating')}")
-                is_valid = False
+    is_valid, errors = _row_errors([
+        (_column(df, "user_id").isna(), "Missing user_id link", None),
+        (_column(df, "recipe_id").isna(), "Missing recipe_id link", None),
+        (~interaction_type.isin(VALID_TYPES), "Invalid interaction type: {}", interaction_type),
+        (interaction_type.eq("rating") & bad_rating,
+         "Rating out of bounds or missing for rating type: {}", rating),
+        (_column(df, "timestamp").isna(), "Missing timestamp", None),
+    ])
+    report = _report({"interaction_id": df["interaction_id"]}, is_valid, errors)
 
-        if pd.isna(row.get("timestamp")):
-            errors.append("Missing timestamp")
-            is_valid = False
+    clean, quarantined = _save_split(df, is_valid, "interactions", key="interaction_id")
+    return report, clean, quarantined
 
-        record = {
-            "interaction_id": row["interaction_id"],
-            "is_valid": is_valid,
-            "errors": errors
-        }
-        report.append(record)
 
-        if not is_valid:
-            quarantine_rows.append(row)
-
-    quarantine_df = pd.DataFrame(quarantine_rows)
-    clean_df = df[~df["interaction_id"].isin(quarantine_df.get("interaction_id", []))]
+#  main validation entry
 
-    quarantine_df.to_csv(os.path.join(VALIDATION_DIR, "quarantined_interactions.csv"), index=False)
-    clean_df.to_csv(os.path.join(VALIDATION_DIR, "clean_interactions.csv"), index=False)
+# (validator, ETL file, report section), in report order
+VALIDATORS = [
+    (validate_recipes, "recipe.csv", "recipes"),
+    (validate_users, "users.csv", "users"),
+    (validate_ingredients, "ingredients.csv", "ingredients"),
+    (validate_steps, "steps.csv", "steps"),
+    (validate_interactions, "interactions.csv", "interactions"),
+]
 
-    return report, len(clean_df), len(quarantine_df)
 
+def _validate_file(validator, path):
+    """Worker: loads one ETL table and runs its validator on it."""
+    df = pd.read_csv(path)
+    if validator is validate_users:
+        return validator(df, source_path=path)
+    return validator(df)
 
-#  main validation entry
 
 def main():
     logger.info("Starting Validation Pipeline...")
+    ensure_output_dirs()
 
     latest_etl_dir = get_latest_etl_version_dir(ETL_ROOT_DIR)
     if not latest_etl_dir:
@@ -311,38 +265,24 @@ def main():
 
     logger.info(f"Using ETL data from latest version folder: {os.path.basename(latest_etl_dir)}")
 
-    # load CSVs from latest ETL version folder
-    recipe_df = pd.read_csv(os.path.join(latest_etl_dir, "recipe.csv"))
-    ingredients_df = pd.read_csv(os.path.join(latest_etl_dir, "ingredients.csv"))
-    steps_df = pd.read_csv(os.path.join(latest_etl_dir, "steps.csv"))
-    interactions_df = pd.read_csv(os.path.join(latest_etl_dir, "interactions.csv"))
-    users_df = pd.read_csv(os.path.join(latest_etl_dir, "users.csv"))
-
     report_data = {}
 
-    recipe_report, r_clean, r_quar = validate_recipes(recipe_df)
-    report_data["recipes"] = recipe_report
-    logger.info(f"[recipes] Processed. Clean: {r_clean} | Quarantined: {r_quar}")
-
-    users_report, u_clean, u_quar = validate_users(users_df)
-    report_data["users"] = users_report
-    logger.info(f"[users] Processed. Clean: {u_clean} | Quarantined: {u_quar}")
-
-    ing_report, i_clean, i_quar = validate_ingredients(ingredients_df)
-    report_data["ingredients"] = ing_report
-    logger.info(f"[ingredients] Processed. Clean: {i_clean} | Quarantined: {i_quar}")
-
-    steps_report, s_clean, s_quar = validate_steps(steps_df)
-    report_data["steps"] = steps_report
-    logger.info(f"[steps] Processed. Clean: {s_clean} | Quarantined: {s_quar}")
-
-    inter_report, inter_clean, inter_quar = validate_interactions(interactions_df)
-    report_data["interactions"] = inter_report
-    logger.info(f"[interactions] Processed. Clean: {inter_clean} | Quarantined: {inter_quar}")
+    # the tables are independent (own input, own output files), so each is
+    # loaded and validated in its own process
+    with ProcessPoolExecutor(max_workers=min(len(VALIDATORS), os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(_validate_file, validator, os.path.join(latest_etl_dir, filename))
+            for validator, filename, _ in VALIDATORS
+        ]
+        for (_, _, section), future in zip(VALIDATORS, futures):
+            report, clean, quarantined = future.result()
+            report_data[section] = report
+            logger.info(f"[{section}] Processed. Clean: {clean} | Quarantined: {quarantined}")
 
     report_path = os.path.join(VALIDATION_DIR, REPORT_FILE)
-    with open(report_path, "w") as f:
-        json.dump(report_data, f, indent=2)
+    # orjson serializes the whole report in C; NaN ids are written as null
+    with open(report_path, "wb") as f:
+        f.write(orjson.dumps(report_data, default=str, option=orjson.OPT_INDENT_2))
 
     logger.info(f"Validation Complete. Clean data ready in {VALIDATION_DIR}")
 